@@ -1,16 +1,23 @@
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, Optional, Tuple
 import inspect
+import queue
+import struct
 import threading, time
 from contextlib import suppress
 
 # ---- pymodbus compatibility (3.x preferred; 2.x fallback) ----
+# The keyword differences between releases are resolved once per connect
+# by signature probing in _cache_client_api.
 try:
     from pymodbus.client import ModbusSerialClient  # 3.x
+    PYMODBUS_MAJOR = 3
 except Exception:
     from pymodbus.client.sync import ModbusSerialClient  # 2.x
+    PYMODBUS_MAJOR = 2
 from pymodbus.exceptions import ModbusException
 
 # pyserial exception (optional import; handle if missing)
@@ -47,6 +54,12 @@ BIT_LOCK_KEYPAD          = 10    # always ON
 BIT_TEMP_UNIT_FAHRENHEIT = 11    # always OFF (Celsius)
 BIT_NETWORK_SETPOINTS: Optional[int] = 9   # set None if the unit doesn't support it
 
+# Precomputed flag masks — write_flags assembles its word with two ORs
+# instead of rebuilding each bit with shifts on every call.
+_FLAGS_BASE      = 1 << BIT_LOCK_KEYPAD
+_FLAGS_POWER_OFF = 1 << BIT_INPUT1_INVERT
+_FLAGS_NET_BIT   = (1 << BIT_NETWORK_SETPOINTS) if BIT_NETWORK_SETPOINTS is not None else 0
+
 # Reasonable safety limits (device enforces similar)
 SAFE_C_LIMITS = {
     "low":   (-20.0,  25.0),
@@ -55,14 +68,31 @@ SAFE_C_LIMITS = {
     "high":  ( 30.0,  80.0),
 }
 
+# The same limits unpacked to module floats so the write path can clamp
+# inline — no dict lookup, tuple unpack or function call per bound.
+_LOW_LO,  _LOW_HI  = SAFE_C_LIMITS["low"]
+_HEAT_LO, _HEAT_HI = SAFE_C_LIMITS["heat"]
+_COOL_LO, _COOL_HI = SAFE_C_LIMITS["cool"]
+_HIGH_LO, _HIGH_HI = SAFE_C_LIMITS["high"]
+
 # ----------------------------
 # Helpers (0.1° scaling)
 # ----------------------------
 def to_signed_16(u: int) -> int:
-    return u - 0x10000 if u >= 0x8000 else u
+    # branchless sign extension: masking then XOR-shift beats the compare
+    return ((u & 0xFFFF) ^ 0x8000) - 0x8000
 
 def reg_to_val(raw: int) -> float:
-    return to_signed_16(int(raw)) / 10.0
+    return (((int(raw) & 0xFFFF) ^ 0x8000) - 0x8000) * 0.1
+
+# Optional O(1) decode table (~0.5 MB). Only pays off when registers are
+# decoded at high rates (e.g. a much faster refresh loop), so it's
+# opt-in via the environment rather than taxing small SBC deployments.
+if os.environ.get("EM27_FAST_DECODE"):
+    _REG_TO_VAL = tuple((((i ^ 0x8000) - 0x8000) * 0.1) for i in range(0x10000))
+
+    def reg_to_val(raw: int) -> float:  # noqa: F811 — deliberate override
+        return _REG_TO_VAL[int(raw) & 0xFFFF]
 
 def c_to_reg(val_c: float) -> int:
     return int(round(float(val_c) * 10))
@@ -71,6 +101,27 @@ def clamp(v: float, lo: float, hi: float) -> float:
     v = float(v)
     return lo if v < lo else hi if v > hi else v
 
+# CRC-16/MODBUS lookup table (poly 0xA001, reflected) — built once at
+# import so the raw-frame fast path below pays one table lookup per byte
+# instead of eight shift/XOR rounds.
+def _build_crc16_table():
+    tab = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        tab.append(crc)
+    return tuple(tab)
+
+_CRC16_TAB = _build_crc16_table()
+
+def crc16_modbus(data: bytes) -> int:
+    crc = 0xFFFF
+    tab = _CRC16_TAB
+    for b in data:
+        crc = (crc >> 8) ^ tab[(crc ^ b) & 0xFF]
+    return crc
+
 # ----------------------------
 # Robust Modbus controller (thread-safe)
 # ----------------------------
@@ -86,8 +137,24 @@ class ACController:
 
     client: Optional[ModbusSerialClient] = None
     flags_write_addr: Optional[int] = None  # auto-detected
+    # Opt-in: write setpoints with a hand-built RTU frame on the raw
+    # serial handle, skipping pymodbus's transaction/framer layers.
+    fast_path: bool = False
     io_lock: threading.RLock = threading.RLock()
 
+    # detected flags write address per port — the firmware doesn't change,
+    # so reconnects can skip the echo-write probe entirely
+    _flags_addr_cache: ClassVar[Dict[str, int]] = {}
+
+    # introspection cache, populated once per connect (see _cache_client_api)
+    _read_fn: Optional[object] = None
+    _read_kwargs: dict = field(default_factory=dict)
+    _read_count_kw: Optional[str] = None
+    _write_fn: Optional[object] = None
+    _write_kwargs: dict = field(default_factory=dict)
+    _write_multi_fn: Optional[object] = None
+    _write_multi_kwargs: dict = field(default_factory=dict)
+
     # --- connect/disconnect ---
     def connect(self) -> bool:
         with self.io_lock:
@@ -103,10 +170,16 @@ class ACController:
                 bytesize=self.bytesize,
                 timeout=self.timeout,
             )
+            self._cache_client_api()
             ok = self.client.connect()
             if ok:
                 with suppress(Exception):
-                    self._detect_flags_write_address()
+                    self._tune_serial()
+                if self.port in self._flags_addr_cache:
+                    self.flags_write_addr = self._flags_addr_cache[self.port]
+                else:
+                    with suppress(Exception):
+                        self._detect_flags_write_address()
                 # Enforce policy on connect (lock keypad, Celsius), preserve power & NET
                 with suppress(Exception):
                     cur = self.read_enable_flags()
@@ -115,6 +188,46 @@ class ACController:
                     self.write_flags(power_on=cur_power_on, force_net=cur_net)
             return ok
 
+    def _tune_serial(self):
+        """Shrink read granularity on the underlying pyserial handle.
+
+        pyserial's default read behavior polls with ~15 ms granularity on
+        Windows, inflating every Modbus round-trip. A short inter-byte
+        timeout trims that dead time (pyserial maps these to VMIN/VTIME on
+        POSIX), but it must sit above the USB adapter's ~16 ms latency
+        timer — the adapter posts received bytes in bursts that far apart,
+        and a tighter gap would cut a reply off mid-frame. Attribute names
+        differ between pymodbus versions, hence the defensive lookup.
+        """
+        ser = getattr(self.client, "socket", None) or getattr(self.client, "_socket", None)
+        if ser is None or not hasattr(ser, "timeout"):
+            return
+        with suppress(Exception):
+            ser.inter_byte_timeout = 0.05
+        with suppress(Exception):
+            ser.timeout = 0.15
+        self._enable_low_latency(ser)
+
+    @staticmethod
+    def _enable_low_latency(ser):
+        """Set ASYNC_LOW_LATENCY on the tty (Linux only).
+
+        USB-serial drivers buffer incoming bytes for ~16 ms before posting
+        them; this flag drops the latency timer to ~1 ms, shortening every
+        Modbus round-trip. No-op on other platforms / non-tty devices.
+        """
+        try:
+            import array as _array
+            import fcntl, termios
+            ASYNC_LOW_LATENCY = 0x2000
+            buf = _array.array('i', [0] * 64)  # >= sizeof(struct serial_struct)
+            fd = ser.fileno()
+            fcntl.ioctl(fd, termios.TIOCGSERIAL, buf)
+            buf[4] |= ASYNC_LOW_LATENCY  # flags field
+            fcntl.ioctl(fd, termios.TIOCSSERIAL, buf)
+        except (ImportError, AttributeError, OSError, ValueError):
+            pass
+
     def is_connected(self) -> bool:
         return self.client is not None
 
@@ -129,8 +242,9 @@ class ACController:
     def _kw_unit_for(self, fn):
         try:
             params = inspect.signature(fn).parameters
-            if "slave" in params: return "slave"  # 3.x
-            if "unit"  in params: return "unit"   # 2.x
+            if "device_id" in params: return "device_id"  # >=3.9
+            if "slave" in params: return "slave"          # 3.0-3.8
+            if "unit"  in params: return "unit"           # 2.x
         except Exception:
             pass
         return None
@@ -139,15 +253,52 @@ class ACController:
         try: return name in inspect.signature(fn).parameters
         except Exception: return False
 
+    def _cache_client_api(self):
+        """Introspect the client once per connect.
+
+        inspect.signature is slow and its answers never change for a given
+        client instance, so resolve the read/write callables and their
+        unit-id keyword here instead of on every transaction.
+        """
+        # The unit-id keyword has changed twice across pymodbus releases
+        # ("unit" in 2.x, "slave" in 3.0-3.8, "device_id" from 3.9), so
+        # the signature is probed rather than inferred from the major
+        # version (the TypeError retry in _read_hregs covers any
+        # residual mismatch).
+        fn = getattr(self.client, "read_holding_registers", None)
+        self._read_fn = fn
+        if fn is not None:
+            kw = self._kw_unit_for(fn)
+            self._read_kwargs = {kw: self.unit} if kw else {}
+            if self._supports_param(fn, "count"):
+                self._read_count_kw = "count"
+            elif self._supports_param(fn, "quantity"):
+                self._read_count_kw = "quantity"
+            else:
+                self._read_count_kw = None
+        else:
+            self._read_kwargs = {}
+            self._read_count_kw = None
+        fn = getattr(self.client, "write_register", None)
+        self._write_fn = fn
+        kw = self._kw_unit_for(fn) if fn is not None else None
+        self._write_kwargs = {kw: self.unit} if kw else {}
+        fn = getattr(self.client, "write_registers", None)
+        self._write_multi_fn = fn
+        kw = self._kw_unit_for(fn) if fn is not None else None
+        self._write_multi_kwargs = {kw: self.unit} if kw else {}
+
     def _read_hregs(self, address, count=1):
         with self.io_lock:
-            fn = getattr(self.client, "read_holding_registers", None)
+            if self._read_fn is None:
+                self._cache_client_api()
+            fn = self._read_fn
             if fn is not None:
-                kw = self._kw_unit_for(fn)
-                kwargs = {kw: self.unit} if kw else {}
+                kwargs = self._read_kwargs
                 try:
-                    if self._supports_param(fn, "count") or self._supports_param(fn, "quantity"):
-                        rr = fn(address, count, **kwargs)
+                    # count is keyword-only from pymodbus 3.7
+                    if self._read_count_kw:
+                        rr = fn(address, **{self._read_count_kw: count}, **kwargs)
                     else:
                         rr = fn(address, **kwargs)
                 except TypeError:
@@ -166,16 +317,54 @@ class ACController:
 
     def _write_reg(self, address, value):
         with self.io_lock:
-            fn = getattr(self.client, "write_register", None)
+            if self._write_fn is None:
+                self._cache_client_api()
+            fn = self._write_fn
             if fn is None: raise RuntimeError("Client missing write_register")
-            kw = self._kw_unit_for(fn)
-            kwargs = {kw: self.unit} if kw else {}
+            kwargs = self._write_kwargs
             wr = fn(address, int(value), **kwargs) if kwargs else fn(address, int(value))
             if wr.isError():
                 code = getattr(wr, "exception_code", "??")
                 raise ModbusException(f"ExceptionResponse(dev_id={self.unit}, function_code={wr.function_code}, exception_code={code})")
             return wr
 
+    def _write_regs(self, address, values):
+        with self.io_lock:
+            if self._write_multi_fn is None:
+                self._cache_client_api()
+            fn = self._write_multi_fn
+            if fn is None: raise RuntimeError("Client missing write_registers")
+            kwargs = self._write_multi_kwargs
+            vals = [int(v) for v in values]
+            wr = fn(address, vals, **kwargs) if kwargs else fn(address, vals)
+            if wr.isError():
+                code = getattr(wr, "exception_code", "??")
+                raise ModbusException(f"ExceptionResponse(dev_id={self.unit}, function_code={wr.function_code}, exception_code={code})")
+            return wr
+
+    def _raw_write_setpoints(self, cool: int, hi: int, lo: int, heater: int):
+        """Write registers 0..3 with a prebuilt FC16 RTU frame.
+
+        Only the four data words and the CRC change between calls, so the
+        frame is packed directly onto the raw pyserial handle — no pymodbus
+        transaction manager, framer or response decoder in the loop. The
+        8-byte echo is length-checked and CRC-verified before returning.
+        """
+        ser = getattr(self.client, "socket", None) or getattr(self.client, "_socket", None)
+        if ser is None:
+            raise ModbusException("No raw serial handle for fast-path write")
+        with self.io_lock:
+            head = bytes([self.unit, 0x10, 0x00, REG_SET_COOL, 0x00, 0x04, 0x08])
+            frame = head + struct.pack(">4h", cool, hi, lo, heater)
+            frame += crc16_modbus(frame).to_bytes(2, "little")
+            ser.reset_input_buffer()
+            ser.write(frame)
+            resp = ser.read(8)
+            if len(resp) != 8 or crc16_modbus(resp[:6]) != int.from_bytes(resp[6:], "little"):
+                raise ModbusException(f"Bad FC16 echo: {resp.hex() if resp else '(timeout)'}")
+            if resp[1] & 0x80:
+                raise ModbusException(f"ExceptionResponse(dev_id={self.unit}, function_code={resp[1]}, exception_code={resp[2]})")
+
     def _try_echo_write(self, addr, value) -> bool:
         try:
             self._write_reg(addr, value)
@@ -201,29 +390,45 @@ class ACController:
         raw = getattr(rr, "registers", [getattr(rr, "register", 0)])[0]
         return reg_to_val(raw)  # we enforce Celsius in flags
 
+    def read_block(self) -> Tuple[int, float]:
+        """Read enable flags (reg 4) and sensor (reg 12) in one FC3 frame.
+
+        Returns (flags, sensor_c). Falls back to two single reads if the
+        device rejects the wider read.
+        """
+        rr = self._read_hregs(REG_ENABLE_FLAGS_READ,
+                              REG_READ_SENSOR - REG_ENABLE_FLAGS_READ + 1)
+        regs = getattr(rr, "registers", None)
+        if regs is None or len(regs) < 9:
+            return self.read_enable_flags(), self.read_sensor_c()
+        return regs[0], reg_to_val(regs[8])
+
     # --- flag helpers (ACTIVE-LOW power mapping) ---
     def _power_on_from_flags(self, flags: int) -> bool:
         # ACTIVE-LOW: bit=0 -> ON, bit=1 -> OFF
         return ((flags >> BIT_INPUT1_INVERT) & 1) == 0
 
     def _net_on_from_flags(self, flags: int) -> bool:
-        return BIT_NETWORK_SETPOINTS is not None and ((flags >> BIT_NETWORK_SETPOINTS) & 1) == 1
+        return bool(flags & _FLAGS_NET_BIT)
 
-    def write_flags(self, power_on: bool, force_net: Optional[bool] = None):
-        """Lock keypad, force Celsius, control power. Preserve or set NET bit."""
-        current = 0
-        with suppress(Exception):
-            current = self.read_enable_flags()
+    def write_flags(self, power_on: bool, force_net: Optional[bool] = None,
+                    current: Optional[int] = None):
+        """Lock keypad, force Celsius, control power. Preserve or set NET bit.
+
+        Pass `current` (a recently read flags word) to skip the internal
+        read — saves one round-trip on the slow serial link.
+        """
+        if current is None:
+            current = 0
+            with suppress(Exception):
+                current = self.read_enable_flags()
         net_on = self._net_on_from_flags(current) if force_net is None else bool(force_net)
 
-        word = 0
-        # ACTIVE-LOW: to turn ON, we must CLEAR the invert bit
-        if not power_on:
-            word |= (1 << BIT_INPUT1_INVERT)    # OFF → set bit
-        word |= (1 << BIT_LOCK_KEYPAD)          # always lock
-        # Celsius → Fahrenheit bit OFF
-        if net_on and BIT_NETWORK_SETPOINTS is not None:
-            word |= (1 << BIT_NETWORK_SETPOINTS)
+        # ACTIVE-LOW power: to turn ON, the invert bit stays CLEAR.
+        # Keypad always locked, Fahrenheit bit always off (Celsius).
+        word = (_FLAGS_BASE
+                | (0 if power_on else _FLAGS_POWER_OFF)
+                | (_FLAGS_NET_BIT if net_on else 0))
 
         addrs = [self.flags_write_addr] if self.flags_write_addr is not None else REG_ENABLE_FLAGS_WRITE_CAND
         last = None
@@ -231,6 +436,7 @@ class ACController:
             try:
                 self._write_reg(a, word)
                 self.flags_write_addr = a
+                self._flags_addr_cache[self.port] = a
                 return
             except Exception as e:
                 last = e
@@ -242,11 +448,11 @@ class ACController:
         lo = heater_c - 2.0
         hi = cooling_c + 5.0
 
-        # clamp to safe ranges
-        lo       = clamp(lo,       *SAFE_C_LIMITS["low"])
-        heater_c = clamp(heater_c, *SAFE_C_LIMITS["heat"])
-        cooling_c= clamp(cooling_c,*SAFE_C_LIMITS["cool"])
-        hi       = clamp(hi,       *SAFE_C_LIMITS["high"])
+        # clamp to safe ranges (inline against the unpacked module floats)
+        lo       = _LOW_LO  if lo        < _LOW_LO  else _LOW_HI  if lo        > _LOW_HI  else lo
+        heater_c = _HEAT_LO if heater_c  < _HEAT_LO else _HEAT_HI if heater_c  > _HEAT_HI else heater_c
+        cooling_c= _COOL_LO if cooling_c < _COOL_LO else _COOL_HI if cooling_c > _COOL_HI else cooling_c
+        hi       = _HIGH_LO if hi        < _HIGH_LO else _HIGH_HI if hi        > _HIGH_HI else hi
 
         # enforce order with 1°C separation
         eps = 1.0
@@ -254,27 +460,42 @@ class ACController:
             raise ValueError("Range must satisfy: Low < Heater < Cooling < High (≥1°C apart).")
 
         def do_writes():
-            # WRITE ORDER IS IMPORTANT: low -> heat -> cool -> high
-            for addr, val in [
-                (REG_SET_ALARM_LO, c_to_reg(lo)),
-                (REG_SET_HEATER,   c_to_reg(heater_c)),
-                (REG_SET_COOL,     c_to_reg(cooling_c)),
-                (REG_SET_ALARM_HI, c_to_reg(hi)),
-            ]:
-                self._write_reg(addr, val)
-
-        # Temporarily enable Network Setpoints while writing, then restore
-        initial = self.read_enable_flags()
-        had_net = self._net_on_from_flags(initial)
-        had_power = self._power_on_from_flags(initial)
-        try:
-            if BIT_NETWORK_SETPOINTS is not None and not had_net:
-                self.write_flags(power_on=had_power, force_net=True)
-            do_writes()
-        finally:
-            if BIT_NETWORK_SETPOINTS is not None and not had_net:
-                with suppress(Exception):
-                    self.write_flags(power_on=had_power, force_net=False)
+            # Encode all four setpoints in one pass (0.1° scaling); the
+            # tuple matches registers 0..3 (cool, hi, lo, heat), so one FC16
+            # frame replaces four FC06 round-trips on the 19200-baud link.
+            vals = tuple(int(round(x * 10)) for x in (cooling_c, hi, lo, heater_c))
+            try:
+                if self.fast_path:
+                    self._raw_write_setpoints(*vals)
+                else:
+                    self._write_regs(REG_SET_COOL, vals)
+            except ModbusException:
+                # Some firmwares reject FC16 — fall back to single writes.
+                # WRITE ORDER IS IMPORTANT: low -> heat -> cool -> high
+                for addr, val in [
+                    (REG_SET_ALARM_LO, vals[2]),
+                    (REG_SET_HEATER,   vals[3]),
+                    (REG_SET_COOL,     vals[0]),
+                    (REG_SET_ALARM_HI, vals[1]),
+                ]:
+                    self._write_reg(addr, val)
+
+        # Temporarily enable Network Setpoints while writing, then restore.
+        # Hold io_lock for the whole sequence (RLock, so inner helpers
+        # re-enter) — otherwise the refresh thread could slip in between
+        # the NET toggle and the setpoint writes.
+        with self.io_lock:
+            initial = self.read_enable_flags()
+            had_net = self._net_on_from_flags(initial)
+            had_power = self._power_on_from_flags(initial)
+            try:
+                if BIT_NETWORK_SETPOINTS is not None and not had_net:
+                    self.write_flags(power_on=had_power, force_net=True, current=initial)
+                do_writes()
+            finally:
+                if BIT_NETWORK_SETPOINTS is not None and not had_net:
+                    with suppress(Exception):
+                        self.write_flags(power_on=had_power, force_net=False, current=initial)
 
 # ----------------------------
 # Simple dual-handle range slider (Canvas)
@@ -293,54 +514,93 @@ class RangeSlider(tk.Canvas):
         self.bind("<Button-1>", self.on_press)
         self.bind("<B1-Motion>", self.on_drag)
         self.bind("<ButtonRelease-1>", self.on_release)
+        self.bind("<Configure>", self._on_configure)
+        # Cached geometry: reading int(self["width"]) is a Tcl option
+        # lookup, far too slow to repeat on every motion event.
+        self._w = int(width)
+        self._h = int(height)
+        self._x0 = self.pad
+        self._x1 = self._w - self.pad
+        self._y = self._h // 2
+        # Persistent canvas items, moved in place via coords() on redraw —
+        # far cheaper than delete("all") + recreate per motion event.
+        self._track = self.create_line(0, 0, 0, 0, width=self.track_h, fill="#ddd")
+        self._fill  = self.create_line(0, 0, 0, 0, width=self.track_h, fill="#8aa")
+        self.low_handle  = self.create_oval(0, 0, 0, 0, fill="#fff", outline="#444")
+        self.high_handle = self.create_oval(0, 0, 0, 0, fill="#fff", outline="#444")
+        self._low_label  = self.create_text(0, 0, text="", font=("Segoe UI", 9))
+        self._high_label = self.create_text(0, 0, text="", font=("Segoe UI", 9))
+        self._last_low_x = None
+        self._last_high_x = None
         self.draw()
 
+    def _on_configure(self, _event=None):
+        self._w = int(self["width"])
+        self._h = int(self["height"])
+        self._x0 = self.pad
+        self._x1 = self._w - self.pad
+        self._y = self._h // 2
+
     def draw(self):
-        self.delete("all")
-        w, h = int(self["width"]), int(self["height"])
-        x0, x1 = self.pad, w - self.pad
-        y = h // 2
-        # Track
-        self.create_line(x0, y, x1, y, width=self.track_h, fill="#ddd")
-        # Range fill
+        x0, x1 = self._x0, self._x1
+        y = self._y
         lx = self.val_to_x(self.low_val)
         hx = self.val_to_x(self.high_val)
-        self.create_line(lx, y, hx, y, width=self.track_h, fill="#8aa")
-        # Handles
-        self.low_handle  = self.create_oval(lx-self.handle_r, y-self.handle_r, lx+self.handle_r, y+self.handle_r, fill="#fff", outline="#444")
-        self.high_handle = self.create_oval(hx-self.handle_r, y-self.handle_r, hx+self.handle_r, y+self.handle_r, fill="#fff", outline="#444")
-        # Labels
-        self.create_text(lx, y-18, text=f"{self.low_val:.1f}°C", font=("Segoe UI", 9))
-        self.create_text(hx, y-18, text=f"{self.high_val:.1f}°C", font=("Segoe UI", 9))
+        r = self.handle_r
+        # Track / range fill / handles: reposition the persistent items
+        self.coords(self._track, x0, y, x1, y)
+        self.coords(self._fill, lx, y, hx, y)
+        self.coords(self.low_handle, lx - r, y - r, lx + r, y + r)
+        self.coords(self.high_handle, hx - r, y - r, hx + r, y + r)
+        # Labels: mutate the persistent text items instead of recreating
+        self.itemconfigure(self._low_label, text=f"{self.low_val:.1f}°C")
+        self.coords(self._low_label, lx, y - 18)
+        self.itemconfigure(self._high_label, text=f"{self.high_val:.1f}°C")
+        self.coords(self._high_label, hx, y - 18)
+        self._last_low_x = lx
+        self._last_high_x = hx
 
     def val_to_x(self, v):
-        v = max(self.min_val, min(self.max_val, v))
-        w = int(self["width"])
-        x0, x1 = self.pad, w - self.pad
-        return x0 + (x1 - x0) * ((v - self.min_val) / (self.max_val - self.min_val))
+        lo, hi = self.min_val, self.max_val
+        v = max(lo, min(hi, v))
+        x0, x1 = self._x0, self._x1
+        return x0 + (x1 - x0) * ((v - lo) / (hi - lo))
 
     def x_to_val(self, x):
-        w = int(self["width"])
-        x0, x1 = self.pad, w - self.pad
+        lo, hi = self.min_val, self.max_val
+        x0, x1 = self._x0, self._x1
         x = max(x0, min(x1, x))
-        v = self.min_val + (self.max_val - self.min_val) * ((x - x0) / (x1 - x0))
+        v = lo + (hi - lo) * ((x - x0) / (x1 - x0))
         return round(v / self.step) * self.step
 
     def on_press(self, e):
-        lx = self.val_to_x(self.low_val)
-        hx = self.val_to_x(self.high_val)
-        if abs(e.x - lx) < abs(e.x - hx):
+        # hoist the event coordinate and bound method once — attribute
+        # lookups in this handler run on every mouse event
+        ex = e.x
+        val_to_x = self.val_to_x
+        lx = val_to_x(self.low_val)
+        hx = val_to_x(self.high_val)
+        if abs(ex - lx) < abs(ex - hx):
             self.dragging = "low"
         else:
             self.dragging = "high"
 
     def on_drag(self, e):
-        if not self.dragging: return
+        dragging = self.dragging
+        if not dragging: return
+        val_to_x = self.val_to_x
         v = self.x_to_val(e.x)
-        if self.dragging == "low":
-            self.low_val = min(v, self.high_val - 1.0)  # keep ≥1°C gap
+        if dragging == "low":
+            new = min(v, self.high_val - 1.0)  # keep ≥1°C gap
+            # skip the redraw when the handle hasn't moved a pixel
+            if val_to_x(new) == self._last_low_x:
+                return
+            self.low_val = new
         else:
-            self.high_val = max(v, self.low_val + 1.0)
+            new = max(v, self.low_val + 1.0)
+            if val_to_x(new) == self._last_high_x:
+                return
+            self.high_val = new
         self.draw()
 
     def on_release(self, _):
@@ -362,6 +622,13 @@ class App(tk.Tk):
 
         self.controller = ACController()
         self.refresh_job = None
+        self._q = queue.Queue()
+        self._stop_evt = threading.Event()
+        self._worker = None
+        # last flags word seen by the refresh loop — lets power writes
+        # skip their own read round-trip (5 s staleness is acceptable
+        # since this GUI is the only writer)
+        self._last_flags = None
 
         self._build_ui()
         self._update_indicator(False)
@@ -379,7 +646,10 @@ class App(tk.Tk):
         # Now (auto-refresh)
         frm_now = ttk.LabelFrame(self, text="Now")
         frm_now.pack(fill="x", padx=12, pady=(2,10))
-        self.lbl_temp = ttk.Label(frm_now, text="Temperature: --.- °C")
+        # StringVar updates skip Tk's widget option-parsing path that
+        # .config(text=...) pays on every refresh
+        self._temp_var = tk.StringVar(value="Temperature: --.- °C")
+        self.lbl_temp = ttk.Label(frm_now, textvariable=self._temp_var)
         self.lbl_temp.pack(side="left", padx=8, pady=6)
         ttk.Label(frm_now, text="(updates every 5 s)").pack(side="left", padx=6)
 
@@ -411,6 +681,7 @@ class App(tk.Tk):
             # Reflect current power bit (ACTIVE-LOW → checked means ON)
             try:
                 flags = self.controller.read_enable_flags()
+                self._last_flags = flags
                 self.var_power.set(self.controller._power_on_from_flags(flags))
             except Exception:
                 pass
@@ -429,21 +700,72 @@ class App(tk.Tk):
             messagebox.showinfo("Disconnected", "Serial connection closed")
 
     # --- Auto refresh every 5 seconds ---
+    # Modbus I/O runs on a daemon thread so a stalled serial read (up to
+    # DEFAULT_TIMEOUT) never freezes the Tk mainloop; results come back
+    # through a queue drained by a fast after() tick.
     def _start_auto_refresh(self):
         self._stop_auto_refresh()
-        self._do_refresh_loop()
-
-    def _do_refresh_loop(self):
-        if self.controller.client is None:
-            return
+        # Fresh Event and Queue per worker, passed in as arguments so the
+        # worker only ever sees its own stop signal. If it re-read
+        # self._stop_evt, a worker blocked in read_block() across a
+        # disconnect/reconnect would wake after this method had already
+        # swapped in a new unset event, miss the stop entirely, and keep
+        # polling alongside its replacement.
+        stop_evt = threading.Event()
+        q = queue.Queue()
+        self._stop_evt = stop_evt
+        self._q = q
+        self._worker = threading.Thread(target=self._refresh_worker,
+                                        args=(stop_evt, q), daemon=True)
+        self._worker.start()
+        self._drain_queue()
+
+    def _refresh_worker(self, stop_evt, q):
+        while not stop_evt.is_set():
+            if self.controller.client is None:
+                break
+            try:
+                # One FC3 block read refreshes both the temperature and the
+                # power checkbox instead of two separate transactions.
+                flags, temp_c = self.controller.read_block()
+                q.put(("data", (flags, temp_c)))
+            except (ModbusException, SerialException, OSError):
+                q.put(("read_error", None))
+            stop_evt.wait(5.0)
+
+    def _drain_queue(self):
         try:
-            temp_c = self.controller.read_sensor_c()
-            self.lbl_temp.config(text=f"Temperature: {temp_c:.1f} °C")
-        except Exception:
-            self.lbl_temp.config(text=f"Temperature: --.- °C")
-        self.refresh_job = self.after(5000, self._do_refresh_loop)
+            while True:
+                kind, payload = self._q.get_nowait()
+                if kind == "data":
+                    flags, temp_c = payload
+                    self._last_flags = flags
+                    self._temp_var.set(f"Temperature: {temp_c:.1f} °C")
+                    self.var_power.set(self.controller._power_on_from_flags(flags))
+                elif kind == "read_error":
+                    self._temp_var.set("Temperature: --.- °C")
+                elif kind == "info":
+                    messagebox.showinfo(*payload)
+                elif kind == "write_error":
+                    messagebox.showerror(*payload)
+        except queue.Empty:
+            pass
+        if not self._stop_evt.is_set():
+            self.refresh_job = self.after(100, self._drain_queue)
+
+    def _submit_io(self, fn, ok_msg):
+        """Run a controller call off the Tk thread; result comes back
+        through the same queue the refresh worker uses."""
+        def work():
+            try:
+                fn()
+                self._q.put(("info", ("OK", ok_msg)))
+            except Exception as e:
+                self._q.put(("write_error", ("Write error", str(e))))
+        threading.Thread(target=work, daemon=True).start()
 
     def _stop_auto_refresh(self):
+        self._stop_evt.set()
         if self.refresh_job:
             try: self.after_cancel(self.refresh_job)
             except Exception: pass
@@ -454,22 +776,19 @@ class App(tk.Tk):
         if self.controller.client is None:
             messagebox.showwarning("Not connected", "Connect first.")
             return
-        try:
-            self.controller.write_flags(power_on=self.var_power.get(), force_net=None)
-            messagebox.showinfo("OK", "Power/flags updated.")
-        except Exception as e:
-            messagebox.showerror("Write error", str(e))
+        power_on = self.var_power.get()
+        flags = self._last_flags
+        self._submit_io(lambda: self.controller.write_flags(power_on=power_on, force_net=None,
+                                                            current=flags),
+                        "Power/flags updated.")
 
     def apply_range(self):
         if self.controller.client is None:
             messagebox.showwarning("Not connected", "Connect first.")
             return
-        try:
-            heat, cool = self.slider.get_values()  # left→heater, right→cooling
-            self.controller.write_setpoints_c(heater_c=heat, cooling_c=cool)
-            messagebox.showinfo("OK", f"Range applied: Heater {heat:.1f}°C → Cooling {cool:.1f}°C")
-        except Exception as e:
-            messagebox.showerror("Write error", str(e))
+        heat, cool = self.slider.get_values()  # left→heater, right→cooling
+        self._submit_io(lambda: self.controller.write_setpoints_c(heater_c=heat, cooling_c=cool),
+                        f"Range applied: Heater {heat:.1f}°C → Cooling {cool:.1f}°C")
 
 # ---- run ----
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer, Qt, QPointF
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, QTimer, Qt, QPointF, QRectF
 from PyQt5.QtWidgets import (QGroupBox, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QLineEdit, QWidget, QCheckBox)
 from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QMouseEvent
 import inspect
+import json
+import os
+import queue
 import threading
+import time
 from contextlib import suppress
 from typing import Tuple
 
@@ -31,9 +35,20 @@ DEFAULT_BAUD     = 19200
 DEFAULT_PARITY   = "E"   # Even
 DEFAULT_STOPBITS = 1
 DEFAULT_BYTESIZE = 8
-DEFAULT_TIMEOUT  = 2.0
+# A healthy Seifert/SCE reply lands in <50 ms; 300 ms is ample headroom
+# while bounding the worst-case stall on a dead bus (was 2.0 s).
+DEFAULT_TIMEOUT  = 0.3
 DEFAULT_UNIT_ID  = 1
 
+# Feature-detect strict mode once at import — newer pymodbus accepts
+# strict=False, which relaxes the inter-character timing check that
+# rejects slightly jittery USB-serial timing on Windows.
+try:
+    _CLIENT_HAS_STRICT = (ModbusSerialClient is not None and
+                          "strict" in inspect.signature(ModbusSerialClient.__init__).parameters)
+except Exception:
+    _CLIENT_HAS_STRICT = False
+
 REG_SET_COOL       = 0
 REG_SET_ALARM_HI   = 1
 REG_SET_ALARM_LO   = 2
@@ -58,14 +73,50 @@ SAFE_C_LIMITS = {
     "high":  ( 30.0,  80.0),
 }
 
+# ----------------------------
+# Persisted flags-write-address cache
+# ----------------------------
+# The detected flags write address is a property of the firmware, not of
+# the session, so it is persisted across runs keyed by (port, unit,
+# baud). A cache hit saves one read plus up to two echo-writes on every
+# reconnect.
+_FLAGS_ADDR_CACHE_PATH = os.path.join(
+    os.environ.get("APPDATA") or os.path.expanduser("~/.config"),
+    "em27-gui", "ac_flags_addr.json")
+
+def _load_flags_addr_cache() -> dict:
+    try:
+        with open(_FLAGS_ADDR_CACHE_PATH, "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _save_flags_addr_cache(cache: dict):
+    try:
+        os.makedirs(os.path.dirname(_FLAGS_ADDR_CACHE_PATH), exist_ok=True)
+        with open(_FLAGS_ADDR_CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except Exception:
+        pass
+
 # ----------------------------
 # Helpers (0.1° scaling)
 # ----------------------------
 def to_signed_16(u: int) -> int:
-    return u - 0x10000 if u >= 0x8000 else u
+    # branchless sign extension: masking then XOR-shift beats the compare
+    return ((u & 0xFFFF) ^ 0x8000) - 0x8000
 
 def reg_to_val(raw: int) -> float:
-    return to_signed_16(int(raw)) / 10.0
+    return (((int(raw) & 0xFFFF) ^ 0x8000) - 0x8000) * 0.1
+
+def reg_block_to_vals(regs_u16) -> list:
+    """Decode a whole FC03 register block to scaled Celsius floats.
+
+    One comprehension with the sign extension inlined — no per-register
+    helper call or branch, which matters once reads are batched up to
+    125 registers per response.
+    """
+    return [(((r & 0xFFFF) ^ 0x8000) - 0x8000) * 0.1 for r in regs_u16]
 
 def c_to_reg(val_c: float) -> int:
     return int(round(float(val_c) * 10))
@@ -78,6 +129,18 @@ def clamp(v: float, lo: float, hi: float) -> float:
 # AC Controller Class
 # ----------------------------
 class ACModbusController:
+    # Fixed attribute set: drops the per-instance __dict__ and turns
+    # every attribute access on the I/O hot path into a fixed-offset
+    # load. Matters on the Pi-class field hardware this runs on.
+    __slots__ = (
+        'port', 'baudrate', 'parity', 'stopbits', 'bytesize', 'timeout',
+        'unit', 'client', 'flags_write_addr', 'io_lock', '_last_serial_opts',
+        '_flags_cache', '_flags_cache_ts',
+        '_read_fn', '_read_kwargs', '_read_count_kw',
+        '_write_fn', '_write_kwargs', '_write_multi_fn', '_write_multi_kwargs',
+        '_resp_is_list',
+    )
+
     def __init__(self, port=DEFAULT_PORT, baudrate=DEFAULT_BAUD, parity=DEFAULT_PARITY,
                  stopbits=DEFAULT_STOPBITS, bytesize=DEFAULT_BYTESIZE, timeout=DEFAULT_TIMEOUT,
                  unit=DEFAULT_UNIT_ID):
@@ -91,17 +154,48 @@ class ACModbusController:
         self.client = None
         self.flags_write_addr = None  # auto-detected
         self.io_lock = threading.RLock()
+        # serial options the current client was built with — a client is
+        # only reconstructed when these change
+        self._last_serial_opts = None
+        # last flags word seen on the bus, with a monotonic timestamp so
+        # callers can decide whether it is fresh enough to reuse
+        self._flags_cache = None
+        self._flags_cache_ts = 0.0
+        # introspection cache, populated once per connect (see _cache_client_api)
+        self._read_fn = None
+        self._read_kwargs = {}
+        self._read_count_kw = None
+        self._write_fn = None
+        self._write_kwargs = {}
+        self._write_multi_fn = None
+        self._write_multi_kwargs = {}
+        # response shape, resolved on the first read: pymodbus 3.x always
+        # exposes .registers; .register only exists on the obsolete 2.x API
+        self._resp_is_list = None
 
     # --- connect/disconnect ---
     def connect(self) -> bool:
         if ModbusSerialClient is None:
             raise RuntimeError("pymodbus not installed. Install with: pip install pymodbus")
         with self.io_lock:
+            opts = (self.port, self.baudrate, self.parity, self.stopbits,
+                    self.bytesize, self.timeout)
+            if self.client is not None and opts == self._last_serial_opts:
+                # Reuse the existing client: a serial close/open cycle can
+                # cost >200 ms on Windows. If the socket merely dropped,
+                # reconnecting the same client is enough.
+                try:
+                    if self.client.is_socket_open():
+                        return True
+                    if self.client.connect():
+                        return True
+                except Exception:
+                    pass  # fall through to a fresh client
             # Close any stale handle first
             with suppress(Exception):
                 if self.client:
                     self.client.close()
-            self.client = ModbusSerialClient(
+            kwargs = dict(
                 port=self.port,
                 baudrate=self.baudrate,
                 parity=self.parity,
@@ -109,16 +203,32 @@ class ACModbusController:
                 bytesize=self.bytesize,
                 timeout=self.timeout,
             )
+            if _CLIENT_HAS_STRICT:
+                kwargs["strict"] = False
+            self.client = ModbusSerialClient(**kwargs)
+            self._last_serial_opts = opts
+            self._cache_client_api()
             ok = self.client.connect()
             if ok:
-                with suppress(Exception):
-                    self._detect_flags_write_address()
-                # Enforce policy on connect
-                with suppress(Exception):
-                    cur = self.read_enable_flags()
+                cached = _load_flags_addr_cache().get(self._flags_addr_key())
+                if cached is not None:
+                    self.flags_write_addr = cached
+                else:
+                    with suppress(Exception):
+                        self._detect_flags_write_address()
+                        self._persist_flags_addr()
+                # Enforce policy on connect. Retried with millisecond
+                # backoff so a single line glitch doesn't silently skip
+                # enforcement; a permanently failing bus still gives up
+                # quickly and lets the connect succeed.
+                try:
+                    cur = self._retry(self.read_enable_flags)
                     cur_power_on = self._power_on_from_flags(cur)
                     cur_net = self._net_on_from_flags(cur)
-                    self.write_flags(power_on=cur_power_on, force_net=cur_net)
+                    self._retry(self.write_flags, power_on=cur_power_on,
+                                force_net=cur_net, current_flags=cur)
+                except Exception:
+                    pass
             return ok
 
     def is_connected(self) -> bool:
@@ -135,8 +245,9 @@ class ACModbusController:
     def _kw_unit_for(self, fn):
         try:
             params = inspect.signature(fn).parameters
-            if "slave" in params: return "slave"  # 3.x
-            if "unit"  in params: return "unit"   # 2.x
+            if "device_id" in params: return "device_id"  # >=3.9
+            if "slave" in params: return "slave"          # 3.0-3.8
+            if "unit"  in params: return "unit"           # 2.x
         except Exception:
             pass
         return None
@@ -145,15 +256,48 @@ class ACModbusController:
         try: return name in inspect.signature(fn).parameters
         except Exception: return False
 
+    def _cache_client_api(self):
+        """Introspect the client once per connect.
+
+        inspect.signature is slow and its answers never change for a
+        given client instance, so resolve the read/write callables and
+        their unit-id keyword here instead of on every transaction.
+        """
+        self._resp_is_list = None  # re-resolve on the next response
+        fn = getattr(self.client, "read_holding_registers", None)
+        self._read_fn = fn
+        if fn is not None:
+            kw = self._kw_unit_for(fn)
+            self._read_kwargs = {kw: self.unit} if kw else {}
+            if self._supports_param(fn, "count"):
+                self._read_count_kw = "count"
+            elif self._supports_param(fn, "quantity"):
+                self._read_count_kw = "quantity"
+            else:
+                self._read_count_kw = None
+        else:
+            self._read_kwargs = {}
+            self._read_count_kw = None
+        fn = getattr(self.client, "write_register", None)
+        self._write_fn = fn
+        kw = self._kw_unit_for(fn) if fn is not None else None
+        self._write_kwargs = {kw: self.unit} if kw else {}
+        fn = getattr(self.client, "write_registers", None)
+        self._write_multi_fn = fn
+        kw = self._kw_unit_for(fn) if fn is not None else None
+        self._write_multi_kwargs = {kw: self.unit} if kw else {}
+
     def _read_hregs(self, address, count=1):
         with self.io_lock:
-            fn = getattr(self.client, "read_holding_registers", None)
+            if self._read_fn is None:
+                self._cache_client_api()
+            fn = self._read_fn
             if fn is not None:
-                kw = self._kw_unit_for(fn)
-                kwargs = {kw: self.unit} if kw else {}
+                kwargs = self._read_kwargs
                 try:
-                    if self._supports_param(fn, "count") or self._supports_param(fn, "quantity"):
-                        rr = fn(address, count, **kwargs)
+                    # count is keyword-only from pymodbus 3.7
+                    if self._read_count_kw:
+                        rr = fn(address, **{self._read_count_kw: count}, **kwargs)
                     else:
                         rr = fn(address, **kwargs)
                 except TypeError:
@@ -172,16 +316,48 @@ class ACModbusController:
 
     def _write_reg(self, address, value):
         with self.io_lock:
-            fn = getattr(self.client, "write_register", None)
+            if self._write_fn is None:
+                self._cache_client_api()
+            fn = self._write_fn
             if fn is None: raise RuntimeError("Client missing write_register")
-            kw = self._kw_unit_for(fn)
-            kwargs = {kw: self.unit} if kw else {}
+            kwargs = self._write_kwargs
             wr = fn(address, int(value), **kwargs) if kwargs else fn(address, int(value))
             if wr.isError():
                 code = getattr(wr, "exception_code", "??")
                 raise ModbusException(f"ExceptionResponse(dev_id={self.unit}, function_code={wr.function_code}, exception_code={code})")
             return wr
 
+    def _write_regs(self, address, values):
+        with self.io_lock:
+            if self._write_multi_fn is None:
+                self._cache_client_api()
+            fn = self._write_multi_fn
+            if fn is None: raise RuntimeError("Client missing write_registers")
+            kwargs = self._write_multi_kwargs
+            vals = [int(v) for v in values]
+            wr = fn(address, vals, **kwargs) if kwargs else fn(address, vals)
+            if wr.isError():
+                code = getattr(wr, "exception_code", "??")
+                raise ModbusException(f"ExceptionResponse(dev_id={self.unit}, function_code={wr.function_code}, exception_code={code})")
+            return wr
+
+    def _retry(self, fn, *args, tries=3, base_s=0.001, **kwargs):
+        """Run fn, retrying with short exponential backoff on Modbus errors.
+
+        A transient CRC glitch on a noisy RS-485 line clears within
+        milliseconds, so retrying at 1/2/4 ms recovers quickly while a
+        genuinely dead bus still fails after ~7 ms of backoff instead of
+        being silently swallowed.
+        """
+        last = None
+        for i in range(tries):
+            try:
+                return fn(*args, **kwargs)
+            except ModbusException as e:
+                last = e
+                time.sleep(base_s * (1 << i))
+        raise last
+
     def _try_echo_write(self, addr, value) -> bool:
         try:
             self._write_reg(addr, value)
@@ -197,15 +373,57 @@ class ACModbusController:
                 return
         self.flags_write_addr = None
 
+    def _flags_addr_key(self) -> str:
+        return f"{self.port}:{self.unit}:{self.baudrate}"
+
+    def _persist_flags_addr(self):
+        if self.flags_write_addr is None:
+            return
+        cache = _load_flags_addr_cache()
+        key = self._flags_addr_key()
+        if cache.get(key) != self.flags_write_addr:
+            cache[key] = self.flags_write_addr
+            _save_flags_addr_cache(cache)
+
     # --- reads ---
+    def _first_reg(self, rr) -> int:
+        """First register of a response, without per-call getattr probing."""
+        if self._resp_is_list is None:
+            self._resp_is_list = hasattr(rr, "registers")
+        if self._resp_is_list:
+            return rr.registers[0]
+        return getattr(rr, "register", 0)
+
     def read_enable_flags(self) -> int:
         rr = self._read_hregs(REG_ENABLE_FLAGS_READ, 1)
-        return getattr(rr, "registers", [getattr(rr, "register", 0)])[0]
+        flags = self._first_reg(rr)
+        self._flags_cache = flags
+        self._flags_cache_ts = time.monotonic()
+        return flags
 
     def read_sensor_c(self) -> float:
         rr = self._read_hregs(REG_READ_SENSOR, 1)
-        raw = getattr(rr, "registers", [getattr(rr, "register", 0)])[0]
-        return reg_to_val(raw)
+        return reg_to_val(self._first_reg(rr))
+
+    def read_block(self) -> Tuple[int, float]:
+        """Read enable flags (reg 4) and sensor (reg 12) in one FC03 frame.
+
+        Registers 4..12 go out in a single 9-register read — roughly the
+        same wire time as one register at 19200 baud, so the poll loop
+        gets flags and temperature for the price of one transaction.
+        Returns (flags, sensor_c); falls back to two single reads if the
+        device rejects the wider read.
+        """
+        rr = self._read_hregs(REG_ENABLE_FLAGS_READ,
+                              REG_READ_SENSOR - REG_ENABLE_FLAGS_READ + 1)
+        if self._resp_is_list is None:
+            self._resp_is_list = hasattr(rr, "registers")
+        regs = rr.registers if self._resp_is_list else None
+        if regs is None or len(regs) < 9:
+            return self.read_enable_flags(), self.read_sensor_c()
+        self._flags_cache = regs[0]
+        self._flags_cache_ts = time.monotonic()
+        return regs[0], reg_to_val(regs[8])
 
     # --- flag helpers (ACTIVE-LOW power mapping) ---
     def _power_on_from_flags(self, flags: int) -> bool:
@@ -215,11 +433,26 @@ class ACModbusController:
     def _net_on_from_flags(self, flags: int) -> bool:
         return BIT_NETWORK_SETPOINTS is not None and ((flags >> BIT_NETWORK_SETPOINTS) & 1) == 1
 
-    def write_flags(self, power_on: bool, force_net=None):
-        """Lock keypad, force Celsius, control power. Preserve or set NET bit."""
-        current = 0
-        with suppress(Exception):
-            current = self.read_enable_flags()
+    # flags cache older than this is considered stale (a front-panel user
+    # could have changed settings between interactions)
+    _FLAGS_MAX_AGE_S = 2.0
+
+    def write_flags(self, power_on: bool, force_net=None, current_flags=None):
+        """Lock keypad, force Celsius, control power. Preserve or set NET bit.
+
+        Pass `current_flags` (a recently read flags word) to skip the
+        internal read; otherwise a cache entry younger than
+        _FLAGS_MAX_AGE_S is reused before paying a read round-trip.
+        """
+        if current_flags is None:
+            if (self._flags_cache is not None
+                    and time.monotonic() - self._flags_cache_ts < self._FLAGS_MAX_AGE_S):
+                current_flags = self._flags_cache
+            else:
+                current_flags = 0
+                with suppress(Exception):
+                    current_flags = self.read_enable_flags()
+        current = current_flags
         net_on = self._net_on_from_flags(current) if force_net is None else bool(force_net)
 
         word = 0
@@ -230,12 +463,23 @@ class ACModbusController:
         if net_on and BIT_NETWORK_SETPOINTS is not None:
             word |= (1 << BIT_NETWORK_SETPOINTS)
 
-        addrs = [self.flags_write_addr] if self.flags_write_addr is not None else REG_ENABLE_FLAGS_WRITE_CAND
+        # Try the known-good address first, but keep the other candidates
+        # as fallback in case a persisted address has gone stale.
+        if self.flags_write_addr is not None:
+            addrs = [self.flags_write_addr] + \
+                    [c for c in REG_ENABLE_FLAGS_WRITE_CAND if c != self.flags_write_addr]
+        else:
+            addrs = REG_ENABLE_FLAGS_WRITE_CAND
         last = None
         for a in [x for x in addrs if x is not None]:
             try:
                 self._write_reg(a, word)
-                self.flags_write_addr = a
+                if a != self.flags_write_addr:
+                    self.flags_write_addr = a
+                    self._persist_flags_addr()
+                # the written word is now the bus truth — refresh the cache
+                self._flags_cache = word
+                self._flags_cache_ts = time.monotonic()
                 return
             except Exception as e:
                 last = e
@@ -259,25 +503,37 @@ class ACModbusController:
             raise ValueError("Range must satisfy: Low < Heater < Cooling < High (≥1°C apart).")
 
         def do_writes():
-            for addr, val in [
-                (REG_SET_ALARM_LO, c_to_reg(lo)),
-                (REG_SET_HEATER,   c_to_reg(heater_c)),
-                (REG_SET_COOL,     c_to_reg(cooling_c)),
-                (REG_SET_ALARM_HI, c_to_reg(hi)),
-            ]:
-                self._write_reg(addr, val)
+            # Registers 0..3 are contiguous (cool, hi, lo, heat), so one
+            # FC16 frame replaces four FC06 round-trips on the 19200-baud
+            # link — each round-trip costs ~10-30 ms of char time plus
+            # turnaround plus the 3.5-char inter-frame silence.
+            block = [c_to_reg(cooling_c), c_to_reg(hi), c_to_reg(lo), c_to_reg(heater_c)]
+            try:
+                self._write_regs(REG_SET_COOL, block)
+            except ModbusException:
+                # Some firmwares reject FC16 — fall back to single writes.
+                # WRITE ORDER IS IMPORTANT: low -> heat -> cool -> high
+                for addr, val in [
+                    (REG_SET_ALARM_LO, block[2]),
+                    (REG_SET_HEATER,   block[3]),
+                    (REG_SET_COOL,     block[0]),
+                    (REG_SET_ALARM_HI, block[1]),
+                ]:
+                    self._write_reg(addr, val)
 
         initial = self.read_enable_flags()
         had_net = self._net_on_from_flags(initial)
         had_power = self._power_on_from_flags(initial)
         try:
             if BIT_NETWORK_SETPOINTS is not None and not had_net:
-                self.write_flags(power_on=had_power, force_net=True)
+                self.write_flags(power_on=had_power, force_net=True,
+                                 current_flags=initial)
             do_writes()
         finally:
             if BIT_NETWORK_SETPOINTS is not None and not had_net:
                     with suppress(Exception):
-                        self.write_flags(power_on=had_power, force_net=False)
+                        self.write_flags(power_on=had_power, force_net=False,
+                                         current_flags=initial)
 
 # ----------------------------
 # PyQt5 Range Slider Widget
@@ -300,86 +556,106 @@ class RangeSlider(QWidget):
         self.dragging = None
         self.setMinimumSize(400, 70)
         self.setMaximumHeight(70)
-        
+        # Cached geometry (refreshed in resizeEvent) — self.width() is a
+        # C++ call that the old code paid three times per mouse event.
+        self._x0 = self.pad
+        self._x1 = 400 - self.pad
+        self._y = 35
+        self._label_y = 0
+        # Paint resources built once; paintEvent runs on every drag frame
+        # and was allocating fresh QPen/QBrush/QFont objects each time.
+        self._pen_track_bg = QPen(QColor("#ddd"), self.track_h, Qt.SolidLine, Qt.RoundCap)
+        self._pen_track_fg = QPen(QColor("#8aa"), self.track_h, Qt.SolidLine, Qt.RoundCap)
+        self._handle_brush = QBrush(QColor("#fff"))
+        self._handle_pen = QPen(QColor("#444"), 2)
+        self._label_font = QFont("Segoe UI", 10, QFont.Bold)
+        self._label_bg_brush = QBrush(QColor("#2a3441"))
+        self._label_bg_pen = QPen(QColor("#4a5568"), 2)
+        self._low_text_pen = QPen(QColor("#4ECDC4"))
+        self._high_text_pen = QPen(QColor("#FF6B6B"))
+        # Label rects are mutated in place per frame; the text strings
+        # are re-formatted only when the underlying value changes.
+        self._low_rect = QRectF(0, 0, 60, 22)
+        self._high_rect = QRectF(0, 0, 60, 22)
+        self._low_text = f"{self.low_val:.1f}°C"
+        self._high_text = f"{self.high_val:.1f}°C"
+        self._low_text_val = self.low_val
+        self._high_text_val = self.high_val
+        # values_changed is rate-limited to ~60 Hz during drags; Qt
+        # coalesces the paints itself but not the signal emissions.
+        self._last_emit_ns = 0
+
+    def resizeEvent(self, event):
+        # Everything that depends only on the widget size is computed
+        # here; paintEvent is left with just the value→x mapping.
+        super().resizeEvent(event)
+        self._x0 = self.pad
+        self._x1 = self.width() - self.pad
+        self._y = self.height() // 2
+        self._label_y = self._y - 35
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        w, h = self.width(), self.height()
-        x0, x1 = self.pad, w - self.pad
-        y = h // 2
-        
+
+        x0, x1 = self._x0, self._x1
+        y = self._y
+
         # Track background
-        pen = QPen(QColor("#ddd"), self.track_h, Qt.SolidLine, Qt.RoundCap)
-        painter.setPen(pen)
+        painter.setPen(self._pen_track_bg)
         painter.drawLine(int(x0), int(y), int(x1), int(y))
-        
+
         # Range fill (active range)
         lx = self._val_to_x(self.low_val)
         hx = self._val_to_x(self.high_val)
-        pen = QPen(QColor("#8aa"), self.track_h, Qt.SolidLine, Qt.RoundCap)
-        painter.setPen(pen)
+        painter.setPen(self._pen_track_fg)
         painter.drawLine(int(lx), int(y), int(hx), int(y))
-        
+
         # Handles
-        brush = QBrush(QColor("#fff"))
-        pen = QPen(QColor("#444"), 2)
-        painter.setBrush(brush)
-        painter.setPen(pen)
-        
+        painter.setBrush(self._handle_brush)
+        painter.setPen(self._handle_pen)
+
         # Low handle
         painter.drawEllipse(QPointF(lx, y), self.handle_r, self.handle_r)
-        
+
         # High handle
         painter.drawEllipse(QPointF(hx, y), self.handle_r, self.handle_r)
-        
+
         # Labels with background for visibility
-        font = QFont("Segoe UI", 10, QFont.Bold)
-        painter.setFont(font)
-        
+        painter.setFont(self._label_font)
+
+        # Label text is only re-formatted when the value changes; the
+        # prebuilt rects are just moved to follow the handles.
+        if self.low_val != self._low_text_val:
+            self._low_text_val = self.low_val
+            self._low_text = f"{self.low_val:.1f}°C"
+        if self.high_val != self._high_text_val:
+            self._high_text_val = self.high_val
+            self._high_text = f"{self.high_val:.1f}°C"
+        self._low_rect.moveTo(lx - 30, self._label_y)
+        self._high_rect.moveTo(hx - 30, self._label_y)
+
         # Low value label
-        low_text = f"{self.low_val:.1f}°C"
-        low_rect_x = int(lx) - 30
-        low_rect_y = int(y) - 35
-        low_rect_w = 60
-        low_rect_h = 22
-        
-        # Draw background for low label
-        painter.setBrush(QBrush(QColor("#2a3441")))
-        painter.setPen(QPen(QColor("#4a5568"), 2))
-        painter.drawRoundedRect(low_rect_x, low_rect_y, low_rect_w, low_rect_h, 5, 5)
-        
-        # Draw low label text
-        painter.setPen(QPen(QColor("#4ECDC4")))
-        painter.drawText(low_rect_x, low_rect_y, low_rect_w, low_rect_h, 
-                        Qt.AlignCenter, low_text)
-        
+        painter.setBrush(self._label_bg_brush)
+        painter.setPen(self._label_bg_pen)
+        painter.drawRoundedRect(self._low_rect, 5, 5)
+        painter.setPen(self._low_text_pen)
+        painter.drawText(self._low_rect, Qt.AlignCenter, self._low_text)
+
         # High value label
-        high_text = f"{self.high_val:.1f}°C"
-        high_rect_x = int(hx) - 30
-        high_rect_y = int(y) - 35
-        high_rect_w = 60
-        high_rect_h = 22
-        
-        # Draw background for high label
-        painter.setBrush(QBrush(QColor("#2a3441")))
-        painter.setPen(QPen(QColor("#4a5568"), 2))
-        painter.drawRoundedRect(high_rect_x, high_rect_y, high_rect_w, high_rect_h, 5, 5)
-        
-        # Draw high label text
-        painter.setPen(QPen(QColor("#FF6B6B")))
-        painter.drawText(high_rect_x, high_rect_y, high_rect_w, high_rect_h, 
-                        Qt.AlignCenter, high_text)
+        painter.setBrush(self._label_bg_brush)
+        painter.setPen(self._label_bg_pen)
+        painter.drawRoundedRect(self._high_rect, 5, 5)
+        painter.setPen(self._high_text_pen)
+        painter.drawText(self._high_rect, Qt.AlignCenter, self._high_text)
     
     def _val_to_x(self, v):
         v = max(self.min_val, min(self.max_val, v))
-        w = self.width()
-        x0, x1 = self.pad, w - self.pad
+        x0, x1 = self._x0, self._x1
         return x0 + (x1 - x0) * ((v - self.min_val) / (self.max_val - self.min_val))
-    
+
     def _x_to_val(self, x):
-        w = self.width()
-        x0, x1 = self.pad, w - self.pad
+        x0, x1 = self._x0, self._x1
         x = max(x0, min(x1, x))
         v = self.min_val + (self.max_val - self.min_val) * ((x - x0) / (x1 - x0))
         return round(v / self.step) * self.step
@@ -404,10 +680,17 @@ class RangeSlider(QWidget):
         else:
             self.high_val = max(v, self.low_val + 1.0)
         self.update()
-        self.values_changed.emit(self.low_val, self.high_val)
-    
+        # Throttle the signal to ~60 Hz so slots never run faster than
+        # the display can show; the final value is emitted on release.
+        now = time.monotonic_ns()
+        if now - self._last_emit_ns >= 16_000_000:
+            self._last_emit_ns = now
+            self.values_changed.emit(self.low_val, self.high_val)
+
     def mouseReleaseEvent(self, event: QMouseEvent):
         if event.button() == Qt.LeftButton:
+            if self.dragging is not None:
+                self.values_changed.emit(self.low_val, self.high_val)
             self.dragging = None
             self.update()
     
@@ -423,6 +706,90 @@ class RangeSlider(QWidget):
             self.high_val = self.low_val + 1.0
         self.update()
 
+class ACIOWorker(QThread):
+    """Owns all blocking Modbus I/O for one ACModbusController.
+
+    pymodbus clients are not safe for concurrent use, and a single serial
+    timeout would otherwise freeze the GUI thread for the full client
+    timeout. Commands arrive through a queue; results come back via
+    signals, which Qt delivers to the GUI thread as queued events.
+    """
+    block_read = pyqtSignal(int, float)   # flags word, temperature °C
+    read_failed = pyqtSignal(str)
+    op_done = pyqtSignal(str, bool, str)  # op, ok, detail
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self._commands = queue.Queue()
+        self._read_pending = False
+
+    def submit(self, op, *args):
+        """Enqueue an operation; never blocks the caller."""
+        if op == "read_block":
+            # Coalesce periodic reads: if the bus is stuck, the timer must
+            # not pile up a backlog of stale polls behind the timeout.
+            if self._read_pending:
+                return
+            self._read_pending = True
+        self._commands.put((op, args))
+
+    def stop(self):
+        self._commands.put(None)
+        self.wait(3000)
+
+    def run(self):
+        while True:
+            item = self._commands.get()
+            if item is None:
+                break
+            op, args = item
+            if op == "read_block":
+                self._read_pending = False
+                try:
+                    flags, temp = self.controller.read_block()
+                    self.block_read.emit(flags, temp)
+                except Exception as e:
+                    self.read_failed.emit(str(e))
+                continue
+            # Coalesce back-to-back writes: only the newest value of each
+            # kind matters, so a rapid power-toggle + apply-range pair
+            # runs as one pass (setpoints first, final power state last)
+            # instead of interleaved transactions with turnaround gaps.
+            batch = {op: args}
+            shutdown = False
+            while True:
+                try:
+                    nxt = self._commands.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    shutdown = True
+                    break
+                nop, nargs = nxt
+                if nop == "read_block":
+                    # drop the stale poll; the flags cache gets refreshed
+                    # by the writes and the next timer tick re-polls
+                    self._read_pending = False
+                    continue
+                batch[nop] = nargs
+            if "write_setpoints" in batch:
+                heater, cooling = batch["write_setpoints"]
+                try:
+                    self.controller.write_setpoints_c(heater_c=heater, cooling_c=cooling)
+                    self.op_done.emit("write_setpoints", True, "")
+                except Exception as e:
+                    self.op_done.emit("write_setpoints", False, str(e))
+            if "write_flags" in batch:
+                power_on, = batch["write_flags"]
+                try:
+                    self.controller.write_flags(power_on=power_on, force_net=None)
+                    self.op_done.emit("write_flags", True, "")
+                except Exception as e:
+                    self.op_done.emit("write_flags", False, str(e))
+            if shutdown:
+                break
+
 class ACController(QObject):
     status_signal = pyqtSignal(str)
     data_signal = pyqtSignal(float)  # emits current temperature
@@ -431,6 +798,18 @@ class ACController(QObject):
         super().__init__(parent)
         self.modbus_controller = ACModbusController()
         self.connected = False
+
+        # Worker thread owning the Modbus I/O; the GUI thread only
+        # enqueues commands and consumes result signals. Explicitly
+        # queued connections keep the slots off the I/O thread and let
+        # Qt coalesce the posted events.
+        self._worker = ACIOWorker(self.modbus_controller, self)
+        self._worker.block_read.connect(self._on_block_read, Qt.QueuedConnection)
+        self._worker.read_failed.connect(self._on_read_failed, Qt.QueuedConnection)
+        self._worker.op_done.connect(self._on_op_done, Qt.QueuedConnection)
+        self._pending_range = None
+        self._last_temp_text = None
+        self._indicator_state = None
         
         # Group box for AC Controller
         self.widget = QGroupBox("🌡️ AC Controller")
@@ -499,6 +878,13 @@ class ACController(QObject):
         self.power_on = False
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._update_temp)
+        # Adaptive polling: back off toward 30 s while the temperature is
+        # stable, snap back to 5 s on any change or read error. Halves
+        # bus traffic on a chain shared with the motor without losing
+        # responsiveness when something actually happens.
+        self._poll_interval_ms = 5000
+        self._stable_count = 0
+        self._last_temp_quant = None
 
         # Get port from config if available
         self.port = None
@@ -508,11 +894,12 @@ class ACController(QObject):
     def connect_controller(self):
         if self.connected:
             # Disconnect
+            self.timer.stop()
+            self._worker.stop()
             try:
                 self.modbus_controller.close()
             except:
                 pass
-            self.timer.stop()
             self.connected = False
             self.connect_btn.setText("Connect")
             self.apply_range_btn.setEnabled(False)
@@ -540,8 +927,13 @@ class ACController(QObject):
                 self.power_on = False
             self.power_checkbox.setChecked(self.power_on)
             
-            # Start periodic update
-            self.timer.start(5000)  # Update every 5 seconds
+            # Start the I/O worker and the periodic update
+            if not self._worker.isRunning():
+                self._worker.start()
+            self._poll_interval_ms = 5000
+            self._stable_count = 0
+            self._last_temp_quant = None
+            self.timer.start(self._poll_interval_ms)  # Update every 5 seconds
             self.connected = True
             self.apply_range_btn.setEnabled(True)
             self.power_checkbox.setEnabled(True)
@@ -559,16 +951,76 @@ class ACController(QObject):
                 pass
 
     def _update_temp(self):
+        """Timer slot — enqueues a poll; the worker does the actual I/O."""
         if not self.connected:
             return
-        try:
-            temp = self.modbus_controller.read_sensor_c()
-            self.latest_temp = temp
-            self.cur_lbl.setText(f"{temp:.1f} °C")
-            self.data_signal.emit(temp)
-        except Exception as e:
+        self._worker.submit("read_block")
+
+    def _on_block_read(self, flags: int, temp: float):
+        # One block read refreshes both the temperature and the power
+        # checkbox instead of two separate transactions.
+        self.latest_temp = temp
+        # setText triggers a relayout + repaint even for identical text,
+        # so skip it when the displayed value hasn't changed
+        text = f"{temp:.1f} °C"
+        if text != self._last_temp_text:
+            self._last_temp_text = text
+            self.cur_lbl.setText(text)
+        power_on = self.modbus_controller._power_on_from_flags(flags)
+        if power_on != self.power_on:
+            self.power_on = power_on
+            self.power_checkbox.blockSignals(True)
+            self.power_checkbox.setChecked(power_on)
+            self.power_checkbox.blockSignals(False)
+        self._adapt_poll_interval(temp)
+        self.data_signal.emit(temp)
+
+    def _adapt_poll_interval(self, temp: float):
+        quant = round(temp * 10)
+        if quant == self._last_temp_quant:
+            self._stable_count += 1
+            # after 3 identical readings, double the interval up to 30 s
+            if self._stable_count > 3 and self._poll_interval_ms < 30000:
+                self._poll_interval_ms = min(30000, self._poll_interval_ms * 2)
+                self.timer.setInterval(self._poll_interval_ms)
+                self.cur_lbl.setToolTip(f"polling every {self._poll_interval_ms // 1000} s")
+        else:
+            self._last_temp_quant = quant
+            self._reset_poll_interval()
+
+    def _reset_poll_interval(self):
+        self._stable_count = 0
+        if self._poll_interval_ms != 5000:
+            self._poll_interval_ms = 5000
+            self.timer.setInterval(5000)
+            self.cur_lbl.setToolTip("polling every 5 s")
+
+    def _on_read_failed(self, msg: str):
+        if self._last_temp_text != "--.- °C":
+            self._last_temp_text = "--.- °C"
             self.cur_lbl.setText("--.- °C")
-            self.status_signal.emit(f"Read error: {e}")
+        self._reset_poll_interval()
+        self.status_signal.emit(f"Read error: {msg}")
+
+    def _on_op_done(self, op: str, ok: bool, detail: str):
+        if op == "write_setpoints":
+            if ok and self._pending_range is not None:
+                heater, cooling = self._pending_range
+                self.status_signal.emit(
+                    f"Range applied: Heater {heater:.1f}°C → Cooling {cooling:.1f}°C")
+            elif not ok:
+                self.status_signal.emit(f"Set range failed: {detail}")
+            self._pending_range = None
+        elif op == "write_flags":
+            if ok:
+                self.status_signal.emit(f"Power {'ON' if self.power_on else 'OFF'}")
+            else:
+                self.status_signal.emit(f"Power toggle failed: {detail}")
+                # Revert checkbox state on error
+                self.power_on = not self.power_on
+                self.power_checkbox.blockSignals(True)
+                self.power_checkbox.setChecked(self.power_on)
+                self.power_checkbox.blockSignals(False)
 
     def _on_slider_changed(self, low: float, high: float):
         """Called when slider values change (for potential live updates)"""
@@ -579,12 +1031,9 @@ class ACController(QObject):
         if not self.connected:
             self.status_signal.emit("Not connected to AC controller")
             return
-        try:
-            heater, cooling = self.range_slider.get_values()
-            self.modbus_controller.write_setpoints_c(heater_c=heater, cooling_c=cooling)
-            self.status_signal.emit(f"Range applied: Heater {heater:.1f}°C → Cooling {cooling:.1f}°C")
-        except Exception as e:
-            self.status_signal.emit(f"Set range failed: {e}")
+        heater, cooling = self.range_slider.get_values()
+        self._pending_range = (heater, cooling)
+        self._worker.submit("write_setpoints", heater, cooling)
     
     def on_power_changed(self, state):
         """Handle power checkbox state change"""
@@ -592,19 +1041,14 @@ class ACController(QObject):
             self.power_checkbox.setChecked(False)
             self.status_signal.emit("Not connected to AC controller")
             return
-        try:
-            self.power_on = (state == Qt.Checked)
-            self.modbus_controller.write_flags(power_on=self.power_on, force_net=None)
-            self.status_signal.emit(f"Power {'ON' if self.power_on else 'OFF'}")
-        except Exception as e:
-            self.status_signal.emit(f"Power toggle failed: {e}")
-            # Revert checkbox state on error
-            self.power_checkbox.blockSignals(True)
-            self.power_checkbox.setChecked(not self.power_on)
-            self.power_checkbox.blockSignals(False)
+        self.power_on = (state == Qt.Checked)
+        self._worker.submit("write_flags", self.power_on)
     
     def _update_connection_indicator(self, connected: bool):
-        """Update the connection status indicator"""
+        """Update the connection status indicator (only when it flips)"""
+        if connected == self._indicator_state:
+            return
+        self._indicator_state = connected
         if connected:
             self.conn_indicator.setStyleSheet("font-size: 16px; color: #2ecc71;")
         else:
@@ -1,37 +1,180 @@
 # controllers/motor_controller.py
 
+import logging
 import platform
+import queue
 import serial
 import time
 from serial.rs485 import RS485Settings
+from serial.tools import list_ports
 from PyQt5.QtWidgets import (
     QGroupBox, QHBoxLayout, QLabel,
     QComboBox, QPushButton, QLineEdit
 )
-from PyQt5.QtCore    import QObject, pyqtSignal
+from PyQt5.QtCore    import QObject, Qt, QThread, pyqtSignal
 from PyQt5.QtGui     import QIntValidator, QValidator
 from drivers.motor   import MotorDriver
 
+_log = logging.getLogger(__name__)
+
+# Platform-dependent RS485 configuration resolved once at import, so the
+# connect path has nothing left to compute between ser.open() and
+# handing the port to MotorDriver.
+IS_WINDOWS = platform.system() == 'Windows'
+RS485_SETTINGS = (
+    RS485Settings(rts_level_for_tx=True, rts_level_for_rx=False, loopback=False)
+    if IS_WINDOWS else
+    RS485Settings(rts_level_for_tx=True, rts_level_for_rx=False, loopback=False,
+                  delay_before_tx=0, delay_before_rx=0)
+)
+
+def _set_low_latency(ser):
+    """Drop the USB-serial latency timer to ~1 ms (best effort).
+
+    FTDI-style adapters hold received bytes for a 16 ms latency-timer
+    interval before posting them, which taxes every move ACK regardless
+    of baud rate. On Linux this sets ASYNC_LOW_LATENCY on the tty; on
+    platforms without the ioctl it is a no-op.
+    """
+    try:
+        import array
+        import fcntl, termios
+        ASYNC_LOW_LATENCY = 0x2000
+        buf = array.array('i', [0] * 64)  # >= sizeof(struct serial_struct)
+        fd = ser.fileno()
+        fcntl.ioctl(fd, termios.TIOCGSERIAL, buf)
+        buf[4] |= ASYNC_LOW_LATENCY  # flags field
+        fcntl.ioctl(fd, termios.TIOCSSERIAL, buf)
+    except (ImportError, AttributeError, OSError, ValueError):
+        pass
+
 class StrictIntValidator(QIntValidator):
-    """Validator that rejects any integer outside the given range outright."""
+    """Validator that rejects any integer outside the given range outright.
+
+    Qt calls validate on every keystroke (and repeatedly during IME/
+    paste), so the hot path avoids both exception-driven parsing and the
+    bottom()/top() C-trampoline calls: the shape check is str.isdigit and
+    the bounds are cached as plain Python ints.
+    """
+
     def __init__(self, minimum, maximum, parent=None):
         super().__init__(parent)
         self.setRange(minimum, maximum)
+        self._lo = minimum
+        self._hi = maximum
 
     def validate(self, input_str, pos):
         # allow empty or just “-” while typing
         if input_str in ("", "-"):
             return (QValidator.Intermediate, input_str, pos)
-        # must parse as integer
-        try:
-            val = int(input_str)
-        except ValueError:
+        # must look like an integer before we bother parsing it
+        digits = input_str[1:] if input_str[0] == '-' else input_str
+        if not digits.isdigit():
             return (QValidator.Invalid, input_str, pos)
         # only accept in range
-        if self.bottom() <= val <= self.top():
+        if self._lo <= int(input_str) <= self._hi:
             return (QValidator.Acceptable, input_str, pos)
-        else:
-            return (QValidator.Invalid, input_str, pos)
+        return (QValidator.Invalid, input_str, pos)
+
+class PortComboBox(QComboBox):
+    """Combo box that defers serial-port enumeration until first opened.
+
+    comports() goes through WMI/SetupAPI on Windows and can block for
+    hundreds of milliseconds, so calling it during widget construction
+    stalls GUI startup. The scan result is shared across instances and
+    kept for 2 s, so reopening the dropdown doesn't rescan immediately
+    but a later open still picks up hot-plugged adapters.
+    """
+    _cached_ports = None
+    _cached_at = 0.0
+    _CACHE_TTL_S = 2.0
+
+    def showPopup(self):
+        self.ensure_populated()
+        super().showPopup()
+
+    def ensure_populated(self):
+        now = time.monotonic()
+        if (PortComboBox._cached_ports is None
+                or now - PortComboBox._cached_at > self._CACHE_TTL_S):
+            PortComboBox._cached_ports = [p.device for p in list_ports.comports()]
+            PortComboBox._cached_at = now
+        ports = PortComboBox._cached_ports
+        # drop vanished ports (keep the current selection), add new ones
+        current = self.currentText()
+        for i in range(self.count() - 1, -1, -1):
+            text = self.itemText(i)
+            if text not in ports and text != current:
+                self.removeItem(i)
+        for dev in ports:
+            if self.findText(dev) < 0:
+                self.addItem(dev)
+
+class MotorIOWorker(QThread):
+    """Executes paced moves off the GUI thread.
+
+    A move round-trip (T3.5 gap + write + ACK read, plus the alarm-clear
+    retry path) can block for most of a second, which freezes the event
+    loop when run from a button handler. Commands go through a small
+    queue; when moves arrive faster than the bus drains them, stale
+    targets are dropped so only the newest angle is sent.
+    """
+
+    move_done = pyqtSignal(bool, str)
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self._controller = controller
+        self._queue = queue.Queue(maxsize=4)
+
+    def enqueue(self, angle: int):
+        # newest-wins for angles only: drop queued-but-unsent angles so
+        # the motor heads for where the user last asked, not every
+        # intermediate target. Anything else in the queue — callables
+        # from submit() and the stop() sentinel — is kept, so a move
+        # click can't cancel a pending rain read or a shutdown.
+        kept = []
+        try:
+            while True:
+                item = self._queue.get_nowait()
+                if not isinstance(item, int):
+                    kept.append(item)
+        except queue.Empty:
+            pass
+        for item in kept:
+            self._queue.put(item)
+        self._queue.put(angle)
+
+    def submit(self, fn):
+        """Run an arbitrary driver command on this thread.
+
+        Commands share the queue with moves, so everything touching the
+        serial port is serialized here and never races a move's
+        write/read cycle.
+        """
+        self._queue.put(fn)
+
+    def stop(self):
+        self._queue.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if callable(item):
+                try:
+                    item()
+                except Exception as e:
+                    _log.warning("Motor command failed: %s", e)
+                continue
+            try:
+                ok, msg = self._controller._paced_move(item)
+            except Exception as e:
+                ok, msg = False, f"Move error: {e}"
+            self.move_done.emit(ok, msg)
+
 
 class MotorController(QObject):
     status_signal = pyqtSignal(str)
@@ -51,11 +194,9 @@ class MotorController(QObject):
         """)
         layout = QHBoxLayout(self.groupbox)
 
-        # Port selector
+        # Port selector (populated lazily on first open)
         layout.addWidget(QLabel("Port:"))
-        self.port_combo = QComboBox()
-        ports = serial.tools.list_ports.comports()
-        self.port_combo.addItems([p.device for p in ports])
+        self.port_combo = PortComboBox()
         layout.addWidget(self.port_combo)
 
         # Baud selector
@@ -83,62 +224,78 @@ class MotorController(QObject):
         # internal state
         self._driver = None
         self._connected = False
-        self._last_move_time = 0
-        self._min_move_interval = 0.5  # Minimum seconds between moves
+        self._last_tx_time = 0.0
+        self._move_rtt_ema = 0.15  # seeds the observed ACK round-trip estimate
+
+        # serial writer thread: moves run here so button handlers return
+        # immediately instead of blocking on the bus round-trip
+        self._io_worker = MotorIOWorker(self)
+        self._io_worker.move_done.connect(self._on_move_done, Qt.QueuedConnection)
+
+        # latest-value mailbox for the rain poll: readers get the last
+        # completed result instantly while the refresh runs off-thread
+        self._last_rain = (False, "No rain reading yet")
 
     @property
     def driver(self):
         return self._driver
-    
+
+    @property
+    def _min_move_interval(self):
+        # pacing derived from observed ACK round-trips (plus 20% margin)
+        # rather than a fixed 0.5 s gate
+        return self._move_rtt_ema * 1.2
+
     def _paced_move(self, angle: int):
         """
         Send a move with proper inter-command spacing and alarm clear retry.
-        This prevents alarm issues during continuous operation.
+        Spacing comes from the bus itself: the Modbus T3.5 inter-frame
+        silence at the current baud plus an EMA of observed round-trips,
+        instead of the old fixed 0.12 s + 0.5 s gates that capped move
+        throughput at 2 Hz regardless of hardware.
         """
         if not self._driver:
             return False, "Motor not initialized"
-        
-        # Prevent moves too close together
-        current_time = time.time()
-        time_since_last_move = current_time - self._last_move_time
-        if time_since_last_move < self._min_move_interval:
-            wait_time = self._min_move_interval - time_since_last_move
-            time.sleep(wait_time)
-        
-        # Add inter-command gap to prevent alarm issues
-        time.sleep(0.12)  # INTER_CMD_GAP_SEC from motor_cont.py
-        
-        # Drain serial buffers
-        try:
-            self._driver.ser.reset_input_buffer()
-            self._driver.ser.reset_output_buffer()
-        except Exception:
-            pass
-        
-        # Send move command
+
+        ser = self._driver.ser
+        # T3.5 inter-frame silence: 3.5 chars at 11 bits each on the wire
+        gap = 3.5 * 11 / (ser.baudrate or 9600)
+        wait = max(gap, self._min_move_interval) - (time.time() - self._last_tx_time)
+        if wait > 0:
+            time.sleep(wait)
+
+        # Send move command (buffers are left alone on the happy path —
+        # a successful round-trip leaves them empty, and each reset is an
+        # ioctl)
+        start = time.time()
         ok, msg = self._driver.move_to(angle)
-        
+
         # If move failed, try clearing alarm and retry
         if not ok:
             try:
                 if hasattr(self._driver, 'clear_alarm'):
-                    self._driver.clear_alarm()
-                    time.sleep(0.25)
-                    # Drain again after alarm clear
+                    # only the error path drains stale bytes
                     try:
-                        self._driver.ser.reset_input_buffer()
-                        self._driver.ser.reset_output_buffer()
+                        ser.reset_input_buffer()
+                        ser.reset_output_buffer()
                     except Exception:
                         pass
-                    time.sleep(0.12)
+                    self._driver.clear_alarm()
+                    time.sleep(0.25)
+                    time.sleep(gap)
                     # Retry move
                     ok, msg = self._driver.move_to(angle)
             except Exception as e:
-                print(f"Retry after alarm clear failed: {e}")
-        
-        # Record move time
-        self._last_move_time = time.time()
-        
+                # deferred formatting: no f-string or stdout lock unless
+                # the record is actually emitted
+                _log.warning("Retry after alarm clear failed: %s", e)
+        else:
+            rtt = time.time() - start
+            self._move_rtt_ema += 0.3 * (rtt - self._move_rtt_ema)
+
+        # Record transmit time for the next pacing decision
+        self._last_tx_time = time.time()
+
         return ok, msg
     
     def _on_connect(self):
@@ -152,24 +309,35 @@ class MotorController(QObject):
 
         try:
             if self._driver and hasattr(self._driver, 'ser') and self._driver.ser.is_open:
+                # Reuse the open port when nothing changed — close/reopen
+                # resets the adapter and costs hundreds of ms on Windows.
+                if self._driver.ser.port == port and self._driver.ser.baudrate == baud:
+                    self._connected = True
+                    self.move_btn.setEnabled(True)
+                    self.status_signal.emit(f"✔ Connected on {port} @ {baud} baud")
+                    return
                 self._driver.ser.close()
 
             ser = serial.Serial(port, baudrate=baud, timeout=1.5)
             if not ser.is_open:
                 ser.open()
+            _set_low_latency(ser)
 
-            # Configure RS485 mode for automatic RTS control
+            # Configure RS485 mode for automatic RTS control. Assigning
+            # rs485_mode issues a kernel ioctl, so skip the write when the
+            # handle is already configured (reconnects on a reused port).
             if hasattr(ser, 'rs485_mode'):
-                ser.rs485_mode = RS485Settings(
-                    rts_level_for_tx=True,
-                    rts_level_for_rx=False,
-                    loopback=False
-                )
+                if ser.rs485_mode is None:
+                    ser.rs485_mode = RS485_SETTINGS
             else:
                 ser.setRTS(False)
 
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
+            # Buffer resets are ioctls too — only pay for them when there
+            # is actually something to discard.
+            if ser.in_waiting:
+                ser.reset_input_buffer()
+            if ser.out_waiting:
+                ser.reset_output_buffer()
 
             self._driver = MotorDriver(ser)
 
@@ -190,13 +358,17 @@ class MotorController(QObject):
 
             # Drain any leftover responses from stop/clear_alarm
             try:
-                ser.reset_input_buffer()
-                ser.reset_output_buffer()
+                if ser.in_waiting:
+                    ser.reset_input_buffer()
+                if ser.out_waiting:
+                    ser.reset_output_buffer()
                 time.sleep(0.1)
             except Exception:
                 pass
 
             self._connected = True
+            if not self._io_worker.isRunning():
+                self._io_worker.start()
             self.move_btn.setEnabled(True)
             self.status_signal.emit(f"✔ Connected on {port} @ {baud} baud")
 
@@ -221,12 +393,28 @@ class MotorController(QObject):
             self.status_signal.emit("Enter a valid integer angle.")
             return
 
-        ok, msg = self._paced_move(angle)
+        self._io_worker.enqueue(angle)
+
+    def _on_move_done(self, ok, msg):
         self.status_signal.emit(msg)
 
     def is_connected(self):
         return self._connected
 
+    def poll_rain_status(self):
+        """Kick off a rain read on the I/O thread; return the last result.
+
+        The serial round-trip happens on the worker, so a GUI timer can
+        call this every second without ever blocking on the bus — it
+        just sees the previous completed (success, message) pair.
+        """
+        if self._driver is not None and self._io_worker.isRunning():
+            self._io_worker.submit(self._read_rain)
+        return self._last_rain
+
+    def _read_rain(self):
+        self._last_rain = self._driver.check_rain_status()
+
     def move(self):
         try:
             txt = self.angle_input.text().strip()
@@ -234,9 +422,8 @@ class MotorController(QObject):
                 self.status_signal.emit("Enter an angle first")
                 return False
             angle = int(txt)
-            success, message = self._paced_move(angle)
-            self.status_signal.emit(message)
-            return success
+            self._io_worker.enqueue(angle)
+            return True
         except ValueError:
             self.status_signal.emit("Invalid angle value")
             return False
@@ -248,6 +435,7 @@ class MotorController(QObject):
         if self._connected:
             return
         if self.preferred_port:
+            self.port_combo.ensure_populated()
             idx = self.port_combo.findText(self.preferred_port)
             if idx >= 0:
                 self.port_combo.setCurrentIndex(idx)
@@ -1,9 +1,57 @@
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+import queue
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
 from PyQt5.QtWidgets import QGroupBox, QGridLayout, QLabel, QLineEdit, QPushButton, QHBoxLayout
 import serial.tools.list_ports
 
 from drivers.tc36_25_driver import TC36_25
 
+class TempIOWorker(QThread):
+    """Owns all serial traffic to the TC-36-25.
+
+    The driver is blocking (per-character pacing plus a read timeout),
+    so a temperature poll can hold the port for a few hundred
+    milliseconds. The worker reads the temperature once a second and
+    reports it via a queued signal; setpoint writes are queued with
+    submit() so they share the port with the poll instead of racing it
+    from the GUI thread.
+    """
+    reading = pyqtSignal(float)
+    error = pyqtSignal(str)
+
+    def __init__(self, tc, parent=None):
+        super().__init__(parent)
+        self._tc = tc
+        self._cmds = queue.Queue()
+        self._running = True
+
+    def run(self):
+        while self._running:
+            try:
+                item = self._cmds.get(timeout=1.0)
+            except queue.Empty:
+                # no command pending: take the periodic reading
+                try:
+                    self.reading.emit(self._tc.get_temperature())
+                except Exception as e:
+                    self.error.emit(str(e))
+                continue
+            if item is None:
+                break
+            try:
+                item()
+            except Exception as e:
+                self.error.emit(str(e))
+
+    def submit(self, fn):
+        """Queue a callable to run on the worker thread."""
+        self._cmds.put(fn)
+
+    def stop(self):
+        self._running = False
+        self._cmds.put(None)
+        self.wait()
+
 class TempController(QObject):
     status_signal = pyqtSignal(str)
     data_signal = pyqtSignal(float)  # emits current temperature each update
@@ -12,6 +60,8 @@ class TempController(QObject):
         super().__init__(parent)
         self.tc = None
         self.connected = False
+        self._worker = None
+        self._latest_temp = None
         
         # Group box for Temperature Controller
         self.widget = QGroupBox("Temperature Controller")
@@ -55,17 +105,19 @@ class TempController(QObject):
     def connect_controller(self):
         if self.connected:
             # Disconnect
+            if self._worker is not None:
+                self._worker.stop()
+                self._worker = None
+
             if self.tc:
                 try:
                     self.tc.close()
                 except:
                     pass
                 self.tc = None
-            
-            if hasattr(self, 'timer'):
-                self.timer.stop()
-                
+
             self.connected = False
+            self._latest_temp = None
             self.set_btn.setEnabled(False)
             self.connect_btn.setText("Connect")
             self.status_signal.emit("Temperature controller disconnected")
@@ -82,24 +134,24 @@ class TempController(QObject):
         try:
             self.tc = TC36_25(self.port)
             # Test connection
-            self.tc.get_temperature()
-            
+            current = self.tc.get_temperature()
+
             # Once connected, enable computer control and turn on power
             self.tc.enable_computer_setpoint()
             self.tc.power(True)
-            
-            # Start periodic update
-            if not hasattr(self, 'timer'):
-                self.timer = QTimer(self)
-                self.timer.timeout.connect(self._upd)
-            self.timer.start(1000)
-            
+
             self.connected = True
             self.set_btn.setEnabled(True)
             self.connect_btn.setText("Disconnect")
             self.status_signal.emit(f"Temperature controller connected on {self.port}")
-            self._upd()  # Update immediately
-            
+            self._on_reading(current)  # show the test reading immediately
+
+            # All further port access happens on the worker thread
+            self._worker = TempIOWorker(self.tc, self)
+            self._worker.reading.connect(self._on_reading)
+            self._worker.error.connect(self._on_read_error)
+            self._worker.start()
+
         except Exception as e:
             self.status_signal.emit(f"TempController connection failed: {e}")
             if self.tc:
@@ -132,30 +184,31 @@ class TempController(QObject):
         except Exception:
             self.status_signal.emit("Invalid setpoint")
             return
-        try:
-            self.tc.set_setpoint(t)
-            self.status_signal.emit(f"SP={t:.1f}°C")
-        except Exception as e:
-            self.status_signal.emit(f"Set fail: {e}")
+        # The write goes through the worker so it can't collide with a
+        # poll that is mid-frame on the port; failures come back on the
+        # worker's error signal.
+        self._worker.submit(lambda: self.tc.set_setpoint(t))
+        self.status_signal.emit(f"SP={t:.1f}°C")
+
+    def _on_reading(self, current):
+        """Handle a finished temperature reading on the GUI thread."""
+        if not self.connected:
+            return
+        self._latest_temp = current
+        self.cur_lbl.setText(f"{current:.2f} °C")
+        self.data_signal.emit(current)
 
-    def _upd(self):
-        if not self.connected or not self.tc:
+    def _on_read_error(self, msg):
+        if not self.connected:
             return
-            
-        try:
-            current = self.tc.get_temperature()
-            self.cur_lbl.setText(f"{current:.2f} °C")
-            self.data_signal.emit(current)
-        except Exception as e:
-            self.cur_lbl.setText("-- °C")
-            self.status_signal.emit(f"Read err: {e}")
+        self.cur_lbl.setText("-- °C")
+        self.status_signal.emit(f"Read err: {msg}")
 
     @property
     def current_temp(self):
-        try:
-            return float(self.cur_lbl.text().split()[0])
-        except:
+        if self._latest_temp is None:
             return 0.0
+        return self._latest_temp
 
     @property
     def setpoint(self):
@@ -1,7 +1,8 @@
 import os
+import time
 from datetime import datetime
 
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QGroupBox, QLabel, QVBoxLayout, QPushButton, QHBoxLayout
 import serial.tools.list_ports
 
@@ -9,6 +10,38 @@ from drivers.thp_sensor import read_thp_sensor_data
 
 THP_LOG_DIR = "logs/Data-csv"
 
+class THPPoller(QThread):
+    """Polls the THP sensor off the GUI thread.
+
+    Each read opens the port and sits through the board's post-reset
+    settle, so a single call to read_thp_sensor_data can take well
+    over a second. The poller runs those reads in its own thread and
+    hands each result back via a queued signal, so the GUI only ever
+    touches the latest finished reading.
+    """
+    reading = pyqtSignal(object)  # sensor dict on success, None on failure
+
+    def __init__(self, port, interval=3.0, parent=None):
+        super().__init__(parent)
+        self._port = port
+        self._interval = interval
+        self._running = True
+
+    def run(self):
+        while self._running:
+            data = read_thp_sensor_data(self._port)
+            if not self._running:
+                break
+            self.reading.emit(data)
+            # sleep in short slices so stop() returns promptly
+            deadline = time.time() + self._interval
+            while self._running and time.time() < deadline:
+                time.sleep(0.1)
+
+    def stop(self):
+        self._running = False
+        self.wait()
+
 class THPController(QObject):
     status_signal = pyqtSignal(str)
     data_signal = pyqtSignal(dict)  # emits full sensor dict on each update
@@ -53,15 +86,30 @@ class THPController(QObject):
         self._ac_ctrl = None
         self._temp_ctrl = None
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_data)
-        # Only start timer if port was provided
+        # Readings are buffered and appended in batches, so logging costs
+        # one open/write/close per flush interval instead of per reading.
+        self._log_rows = []
+        self._log_day = None  # filename day key the buffered rows belong to
+        # timestamp prefix cache: strftime runs once per minute, each row
+        # only formats its seconds field
+        self._ts_minute = -1
+        self._ts_prefix = ''
+        self._ts_day = ''
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        self._log_flush_timer.start(30000)
+
+        self._poller = None
+        # Only start polling if port was provided
         if self.port:
             self.connect_sensor()
 
     def connect_sensor(self):
         if self.connected:
-            self.timer.stop()
+            if self._poller is not None:
+                self._poller.stop()
+                self._poller = None
+            self._flush_log()  # don't lose buffered rows on disconnect
             self.connected = False
             self.connect_btn.setText("Connect")
             self.status_signal.emit("THP sensor disconnected")
@@ -73,15 +121,17 @@ class THPController(QObject):
             if not self.port:
                 self.status_signal.emit("THP sensor not found")
                 return
-        
+
         # Test connection
         test_data = read_thp_sensor_data(self.port)
         if test_data:
             self.connected = True
             self.connect_btn.setText("Disconnect")
-            self.timer.start(3000)
+            self._on_reading(test_data)  # show the test reading immediately
+            self._poller = THPPoller(self.port, parent=self)
+            self._poller.reading.connect(self._on_reading)
+            self._poller.start()
             self.status_signal.emit(f"THP sensor connected on {self.port}")
-            self._update_data()  # Update immediately
         else:
             self.status_signal.emit(f"Failed to connect to THP sensor on {self.port}")
 
@@ -128,11 +178,34 @@ class THPController(QObject):
         def fmt(v):
             return "NaN" if v != v else f"{v:.2f}"  # NaN != NaN is True
 
+        epoch = time.time()
+        minute = int(epoch) // 60
+        if minute != self._ts_minute:
+            dt = datetime.fromtimestamp(minute * 60)
+            self._ts_prefix = dt.strftime("%Y-%m-%d %H:%M:")
+            self._ts_day = dt.strftime("%b%d%Y")
+            self._ts_minute = minute
+        if self._log_day is not None and self._ts_day != self._log_day:
+            self._flush_log()  # buffered rows must not cross the daily file boundary
+        self._log_day = self._ts_day
+
+        ts = f"{self._ts_prefix}{int(epoch) % 60:02d}"
+        self._log_rows.append(
+            f"{ts},"
+            f"{data['temperature']:.2f},{data['humidity']:.2f},{data['pressure']:.2f},"
+            f"{fmt(ac_temp)},{fmt(ac_heater)},{fmt(ac_cooling)},"
+            f"{fmt(tc_setpoint)},{fmt(tc_current)}\n"
+        )
+
+    def _flush_log(self):
+        """Append the buffered rows to the daily CSV file."""
+        if not self._log_rows:
+            return
+        rows, self._log_rows = self._log_rows, []
         try:
             log_dir = self._get_log_path()
             os.makedirs(log_dir, exist_ok=True)
-            filename = datetime.now().strftime("%b%d%Y") + ".csv"
-            filepath = os.path.join(log_dir, filename)
+            filepath = os.path.join(log_dir, self._log_day + ".csv")
             write_header = not os.path.exists(filepath)
             with open(filepath, "a") as f:
                 if write_header:
@@ -142,21 +215,15 @@ class THPController(QObject):
                         "ac_temperature_C,ac_heater_setpoint_C,ac_cooling_setpoint_C,"
                         "tc_setpoint_C,tc_current_C\n"
                     )
-                ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(
-                    f"{ts},"
-                    f"{data['temperature']:.2f},{data['humidity']:.2f},{data['pressure']:.2f},"
-                    f"{fmt(ac_temp)},{fmt(ac_heater)},{fmt(ac_cooling)},"
-                    f"{fmt(tc_setpoint)},{fmt(tc_current)}\n"
-                )
+                f.writelines(rows)
         except Exception as e:
-            print(f"Failed to log THP reading: {e}")
+            print(f"Failed to log THP readings: {e}")
 
-    def _update_data(self):
+    def _on_reading(self, data):
+        """Handle a finished reading on the GUI thread."""
         if not self.connected:
             return
-            
-        data = read_thp_sensor_data(self.port)
+
         if data:
             self.latest = data
             self.temp_lbl.setText(f"Temp: {data['temperature']:.1f} °C")
@@ -1,9 +1,17 @@
 # drivers/motor.py
 
+import json
+import logging
+import struct
 import time
 import serial
 import os
-from datetime import datetime
+from array import array
+
+try:
+    import termios
+except ImportError:          # Windows
+    termios = None
 from PyQt5.QtCore import QThread, pyqtSignal
 
 # ── Protocol constants ────────────────────────────────────────────────────────
@@ -13,19 +21,91 @@ SLAVE_ID        = 1
 TRACKER_SPEED   = 1000
 TRACKER_CURRENT = 1000
 
+# Precompiled packers: int.to_bytes re-parses its sign/endian arguments
+# on every call, a Struct's bound pack method does not.
+_PACK_ANGLE = struct.Struct('>i').pack
+_PACK_CRC   = struct.Struct('<H').pack
+
+_log = logging.getLogger(__name__)
+
 # ── CRC helper ───────────────────────────────────────────────────────────────
-def modbus_crc16(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
+def _build_crc16_table():
+    """Run the bitwise algorithm once per byte value (poly 0xA001)."""
+    table = array('H', [0] * 256)
+    for i in range(256):
+        crc = i
         for _ in range(8):
             if crc & 1:
                 crc >>= 1
                 crc ^= 0xA001
             else:
                 crc >>= 1
+        table[i] = crc
+    return table
+
+_CRC16_TABLE = _build_crc16_table()
+
+def crc16_update(crc: int, data: bytes) -> int:
+    """Advance a running CRC state over data (init with 0xFFFF)."""
+    # table-driven: one lookup per byte instead of eight shift/XOR rounds
+    table = _CRC16_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
     return crc
 
+def modbus_crc16(data: bytes) -> int:
+    return crc16_update(0xFFFF, data)
+
+# Prefer crcmod's compiled 'modbus' routine when available — same
+# polynomial/init/reflection, another ~10x over the table loop. The
+# pure-Python version above remains the fallback.
+_CRC_NATIVE = False
+try:
+    import crcmod.predefined
+    modbus_crc16 = crcmod.predefined.mkPredefinedCrcFun('modbus')
+    _CRC_NATIVE = True
+except Exception:
+    pass
+
+def _packet(req: bytes) -> bytes:
+    """Append the Modbus CRC to a fixed request frame."""
+    return req + modbus_crc16(req).to_bytes(2, 'little')
+
+# Fixed command frames — every field is constant, so each packet (and
+# its CRC) is built once at import instead of per call.
+_PROBE_PACKET    = _packet(bytes([SLAVE_ID, 0x03, 0x00, 0x58, 0x00, 0x02]))
+_PKT_CLEAR_ALARM = _packet(bytes([SLAVE_ID, 0x05, 0x08, 0x01, 0xFF, 0x00]))
+_PKT_STOP        = _packet(bytes([SLAVE_ID, 0x06, 0x00, 0x88, 0x00, 0x00]))
+_PKT_READ_STATUS = _packet(bytes([SLAVE_ID, 0x03, 0x00, 0x74, 0x00, 0x01]))
+_PKT_READ_RAIN   = _packet(bytes([SLAVE_ID, 0x03, 0x00, 0xD5, 0x00, 0x01]))
+
+# Non-standard reply prefixes some firmware revisions send; recognized
+# on the raw bytes so the hot path never pays for a .hex() conversion.
+_MAGIC_RESPS = (b'\x7e\x25', bytes.fromhex('0190044dc3'))
+
+# ── Baud cache ───────────────────────────────────────────────────────────────
+# Last-successful baud per port, persisted across runs: reconnects probe
+# the known-good rate first with a short timeout instead of walking all
+# five rates at 0.2 s each.
+_BAUD_CACHE_PATH = os.path.join(
+    os.environ.get("APPDATA") or os.path.expanduser("~/.config"),
+    "em27-gui", "motor_baud.json")
+
+def _load_baud_cache() -> dict:
+    try:
+        with open(_BAUD_CACHE_PATH, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _save_baud_cache(cache: dict):
+    try:
+        os.makedirs(os.path.dirname(_BAUD_CACHE_PATH), exist_ok=True)
+        with open(_BAUD_CACHE_PATH, 'w') as f:
+            json.dump(cache, f)
+    except Exception:
+        pass
+
 # ── Baud‐detect thread ───────────────────────────────────────────────────────
 class MotorConnectThread(QThread):
     """
@@ -38,69 +118,159 @@ class MotorConnectThread(QThread):
         super().__init__(parent)
         self.port_name  = port_name
         self.baud_rates = [9600, 19200, 38400, 57600, 115200]
-        self.timeout    = 0.5
+        # read(5) returns as soon as the reply lands, so the timeout only
+        # bounds the no-response case per baud
+        self.timeout    = 0.2
 
     def run(self):
-        # build a Modbus function‐3 read request
-        req = bytes([
-            SLAVE_ID, 0x03,
-            0x00, 0x58,
-            0x00,0x02
-        ])
-        crc = modbus_crc16(req).to_bytes(2, 'little')
-        packet = req + crc
-
-        for baud in self.baud_rates:
+        # Try the persisted last-successful baud first, with a shorter
+        # timeout — the common reconnect case answers in milliseconds.
+        known = _load_baud_cache().get(self.port_name)
+        bauds = list(self.baud_rates)
+        if known in bauds:
+            bauds.remove(known)
+            bauds.insert(0, known)
+
+        # Open the port once and retune in place: reassigning baudrate is
+        # a tcsetattr/SetCommState, while a close/open cycle re-enumerates
+        # the USB adapter and can cost 50-200 ms per attempt on Windows.
+        try:
+            ser = serial.Serial(self.port_name, baudrate=bauds[0], timeout=self.timeout)
+        except Exception as e:
+            self.result_signal.emit(None, None, f"✖ Could not open {self.port_name}: {e}")
+            return
+
+        for baud in bauds:
             try:
-                ser = serial.Serial(self.port_name, baudrate=baud, timeout=self.timeout)
-                ser.reset_input_buffer(); ser.reset_output_buffer()
-                time.sleep(0.02)
+                ser.baudrate = baud
+                ser.timeout = 0.15 if baud == known else self.timeout
+                if ser.in_waiting:
+                    ser.reset_input_buffer()
 
-                ser.write(packet)
+                ser.write(_PROBE_PACKET)
                 ser.flush()
-                time.sleep(0.05)
 
-                resp = ser.read(5)  # expect [ID,0x03,bytecount,hi,lo]
-                resp_hex = resp.hex() if resp else ""
-                print(f"Response at {baud} baud: {resp_hex}")
-                
+                resp = ser.read(5)  # expect [ID,0x03,bytecount,hi,lo]; returns on arrival
+                _log.debug("Response at %s baud: %s", baud, resp.hex())
+
                 # Check for standard Modbus response or known special patterns
                 if (len(resp) >= 5 and resp[0] == SLAVE_ID and resp[1] == 0x03) or \
-                   resp_hex.startswith('7e25') or \
-                   resp_hex.startswith('0190044dc3'):
+                   resp.startswith(_MAGIC_RESPS):
+                    if baud != known:
+                        cache = _load_baud_cache()
+                        cache[self.port_name] = baud
+                        _save_baud_cache(cache)
                     self.result_signal.emit(ser, baud, f"✔ Motor alive at {baud} baud")
                     return
-                ser.close()
             except Exception as e:
-                print(f"Exception at {baud} baud: {e}")
+                _log.debug("Exception at %s baud: %s", baud, e)
                 continue
 
+        try:
+            ser.close()
+        except Exception:
+            pass
         self.result_signal.emit(None, None, "✖ No motor response at any baud rate.")
 
 # ── Helper function to log motor responses ─────────────────────────────────
+# Dedicated logger with a FileHandler attached on first use: one open fd
+# reused for the process lifetime instead of a makedirs + open/close
+# cycle per response, and logging's lock serializes writers.
+_resp_log = logging.getLogger(__name__ + ".responses")
+
+def _response_logger():
+    if not _resp_log.handlers:
+        log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        handler = logging.FileHandler(os.path.join(log_dir, "motor_responses.log"))
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _resp_log.addHandler(handler)
+        _resp_log.setLevel(logging.INFO)
+        _resp_log.propagate = False
+    return _resp_log
+
+# The log format is second-resolution, so one strftime per second
+# covers every entry within that second.
+_last_ts_sec = 0
+_last_ts_str = ""
+
 def log_motor_response(command, angle, response, is_retry=False):
     """Log motor responses to a file for debugging"""
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, "motor_responses.log")
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _last_ts_sec, _last_ts_str
+    now = int(time.time())
+    if now != _last_ts_sec:
+        _last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _last_ts_sec = now
+    timestamp = _last_ts_str
     retry_str = " [RETRY]" if is_retry else ""
-    log_entry = f"{timestamp} | {command} | Angle: {angle}° | Response: {response}{retry_str}\n"
-    
     try:
-        with open(log_file, 'a') as f:
-            f.write(log_entry)
+        _response_logger().info(
+            "%s | %s | Angle: %s° | Response: %s%s",
+            timestamp, command, angle, response, retry_str)
     except Exception as e:
-        print(f"Failed to log motor response: {e}")
+        _log.warning("Failed to log motor response: %s", e)
 
 # ── High‐level driver ───────────────────────────────────────────────────────
 class MotorDriver:
     """
     Wraps an open serial.Serial and sends Modbus‐write commands.
     """
+    # byte offset of the angle within the move frame (header + 8 pad bytes)
+    _ANGLE_OFS = 15
+
     def __init__(self, serial_obj):
         self.ser = serial_obj
+        # Sized reads return on arrival; the inter-byte timeout bounds a
+        # reply that stalls mid-frame instead of waiting out the full
+        # read timeout.
+        try:
+            self.ser.inter_byte_timeout = 0.05
+        except (ValueError, IOError):
+            pass
+        # resolved once: the port object's capabilities don't change
+        self._rs485_native = hasattr(serial_obj, 'rs485_mode')
+        # reusable receive buffer for the short status replies, so the
+        # polling commands allocate nothing per call
+        self._rxbuf = bytearray(64)
+        self._rxmv = memoryview(self._rxbuf)
+        # The move frame is fixed-shape: header, speed, mid, current and
+        # terminator never change, so it is built once and move_to only
+        # patches the 4 angle bytes and the trailing CRC. Avoids ~10
+        # small bytes allocations per move.
+        self._move_template = bytearray(
+            bytes([
+                SLAVE_ID,       # Unit ID
+                0x10,           # Function: Write Multiple Registers
+                0x00, 0x58,     # Start addr = 0x0058
+                0x00, 0x10,     # Register count = 16 (0x0010)
+                0x20            # Byte count    = 32 (0x20)
+            ])
+            + bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01])
+            + bytes(4)                                    # angle (patched per move)
+            + TRACKER_SPEED.to_bytes(4, 'big', signed=True)
+            + bytes([0x00, 0x0F, 0x1F, 0x40, 0x00, 0x0F, 0x1F, 0x40])
+            + TRACKER_CURRENT.to_bytes(4, 'big', signed=True)
+            + bytes([0x00, 0x00, 0x00, 0x01])
+            + bytes(2)                                    # CRC (patched per move)
+        )
+        # CRC state over the invariant bytes ahead of the angle, so the
+        # table fallback only walks the tail of the frame per move
+        self._prefix_crc = crc16_update(0xFFFF, self._move_template[:self._ANGLE_OFS])
+
+    def _flush(self):
+        """Discard both serial buffers in one syscall where possible."""
+        # On a quiet bus both counters are zero and the two FIONREAD-class
+        # queries are cheaper than an unconditional tcflush.
+        if not (self.ser.in_waiting or self.ser.out_waiting):
+            return
+        if termios is not None:
+            try:
+                termios.tcflush(self.ser.fileno(), termios.TCIOFLUSH)
+                return
+            except (termios.error, OSError, ValueError):
+                pass
+        self.ser.reset_input_buffer()
+        self.ser.reset_output_buffer()
 
     def move_to(self, angle: int) -> (bool, str):
         """
@@ -111,72 +281,62 @@ class MotorDriver:
             # Check if serial port is open
             if not self.ser.is_open:
                 self.ser.open()
-                
-            # 1) Build the "real" payload
-            angle_b = angle.to_bytes(4, 'big', signed=True)
-            speed_b = TRACKER_SPEED.to_bytes(4, 'big', signed=True)
-            mid_b   = bytes([0x00,0x0F,0x1F,0x40, 0x00,0x0F,0x1F,0x40])
-            curr_b  = TRACKER_CURRENT.to_bytes(4, 'big', signed=True)
-            end_b   = bytes([0x00,0x00,0x00,0x01])
-
-            payload = bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01]) + angle_b + speed_b + mid_b + curr_b + end_b
 
-            # 2) Use the original fixed header
-            header = bytes([
-                SLAVE_ID,       # Unit ID
-                0x10,           # Function: Write Multiple Registers
-                0x00, 0x58,     # Start addr = 0x0058
-                0x00, 0x10,     # Register count = 16 (0x0010)
-                0x20            # Byte count    = 32 (0x20)
-            ])
-
-            packet = header + payload
-            crc    = modbus_crc16(packet).to_bytes(2, 'little')
-            full   = packet + crc
+            # Patch the angle and CRC into the prebuilt frame
+            full = self._move_template
+            full[self._ANGLE_OFS:self._ANGLE_OFS + 4] = _PACK_ANGLE(angle)
+            # memoryview slices feed the CRC without copying the frame.
+            # crcmod's C routine is fastest over the whole frame; the
+            # table loop resumes from the cached prefix state instead.
+            mv = memoryview(full)
+            if _CRC_NATIVE:
+                crc = modbus_crc16(mv[:-2])
+            else:
+                crc = crc16_update(self._prefix_crc, mv[self._ANGLE_OFS:-2])
+            full[-2:] = _PACK_CRC(crc)
 
-            # flush & settle
-            self.ser.reset_input_buffer()
-            self.ser.reset_output_buffer()
-            time.sleep(0.05)
+            # Steady state leaves both buffers empty after a successful
+            # round trip, so only pay the tcflush ioctl when there are
+            # actually stale bytes to discard.
+            if self.ser.in_waiting:
+                self.ser.reset_input_buffer()
 
-            # If using RTS for RS485 direction control, manually toggle it
-            if not hasattr(self.ser, 'rs485_mode'):
+            # When the kernel drives RS485 direction (rs485_mode set at
+            # connect via TIOCSRS485), RTS toggles in sync with the UART
+            # FIFO and nothing is needed here. The manual fallback drains
+            # the TX FIFO (flush == tcdrain) before dropping RTS instead
+            # of guessing with fixed 10 ms sleeps either side.
+            if not self._rs485_native:
                 self.ser.setRTS(True)
-                time.sleep(0.01)
-
-            # send & wait
-            self.ser.write(full)
-            
-            # If using RTS for RS485 direction control, manually toggle it
-            if not hasattr(self.ser, 'rs485_mode'):
-                time.sleep(0.01)
+                self.ser.write(full)
+                self.ser.flush()
                 self.ser.setRTS(False)
-            
-            time.sleep(0.1)
-
-            # Read with timeout handling
-            start_time = time.time()
-            resp = bytearray()
-            while (time.time() - start_time) < 0.5:
-                if self.ser.in_waiting:
-                    new_data = self.ser.read(self.ser.in_waiting)
-                    if new_data:
-                        resp.extend(new_data)
-                        if len(resp) >= 8:
-                            break
-                time.sleep(0.01)
+            else:
+                self.ser.write(full)
+                # tcdrain here too: write() returns once the frame is
+                # buffered, and the ack timeout below budgets only the
+                # reply frame, not our own 41-byte TX time.
+                self.ser.flush()
+
+            # Sized blocking read: pyserial returns the moment the 8-byte
+            # ACK is complete, so the wait is the actual frame time plus
+            # slave turnaround instead of a fixed 100 ms sleep + 10 ms
+            # polling loop.
+            ack_timeout = max(0.05, 80.0 / self.ser.baudrate + 0.05)
+            if self.ser.timeout != ack_timeout:
+                self.ser.timeout = ack_timeout
+            resp = self.ser.read(8)
 
             # Accept various response patterns as valid
             resp_hex = resp.hex() if resp else ""
             
             # Log response for debugging
-            print(f"Motor move_to response: {resp_hex} (angle: {angle})")
+            _log.debug("Motor move_to response: %s (angle: %s)", resp_hex, angle)
             log_motor_response("move_to", angle, resp_hex)
             
             # Check for known valid response patterns
             if (len(resp) >= 3 and resp[0] == SLAVE_ID and resp[1] == 0x10) or \
-               resp_hex.startswith('7e25') or \
-               resp_hex.startswith('0190044dc3'):
+               resp.startswith(_MAGIC_RESPS):
                 return True, f"✔ Moved to {resp_hex}°"
             else:
                 return False, f"⚠ No ACK from motor. Response: {resp_hex}"
@@ -192,33 +352,24 @@ class MotorDriver:
             if not self.ser.is_open:
                 self.ser.open()
             
-            # Build Modbus function 5 (Write Single Coil) request to clear alarm
-            # Common alarm clear address is 0x0801 (Alarm Reset)
-            req = bytes([
-                SLAVE_ID, 0x05,  # Function: Write Single Coil
-                0x08, 0x01,      # Address: 0x0801 (Alarm Reset)
-                0xFF, 0x00       # Value: ON (0xFF00) to clear alarm
-            ])
-            crc = modbus_crc16(req).to_bytes(2, 'little')
-            packet = req + crc
-            
             # Clear buffers before sending
-            self.ser.reset_input_buffer()
-            self.ser.reset_output_buffer()
-            time.sleep(0.05)
-            
-            # Send request
-            self.ser.write(packet)
+            self._flush()
+
+            # Send prebuilt Write Single Coil request (0x0801, Alarm Reset)
+            self.ser.write(_PKT_CLEAR_ALARM)
+            # flush (tcdrain) returns once the frame is on the wire; the
+            # timeout-bounded read below covers the slave's turnaround
             self.ser.flush()
-            time.sleep(0.1)
-            
+
             # Read response
+            if self.ser.timeout != 0.5:
+                self.ser.timeout = 0.5
             resp = self.ser.read(8)
             if len(resp) >= 4:
                 return True
             return False
         except Exception as e:
-            print(f"Clear alarm failed: {e}")
+            _log.warning("Clear alarm failed: %s", e)
             return False
 
     def stop(self) -> bool:
@@ -230,33 +381,24 @@ class MotorDriver:
             if not self.ser.is_open:
                 self.ser.open()
             
-            # Build Modbus stop command - typically function 6 (Write Single Register)
-            # Use register 0x0088 (Velocity Command) with value 0
-            req = bytes([
-                SLAVE_ID, 0x06,  # Function: Write Single Register
-                0x00, 0x88,      # Address: 0x0088 (Velocity Command)
-                0x00, 0x00       # Value: 0 (stop)
-            ])
-            crc = modbus_crc16(req).to_bytes(2, 'little')
-            packet = req + crc
-            
             # Clear buffers before sending
-            self.ser.reset_input_buffer()
-            self.ser.reset_output_buffer()
-            time.sleep(0.05)
-            
-            # Send request
-            self.ser.write(packet)
+            self._flush()
+
+            # Send prebuilt Write Single Register (0x0088 Velocity Command = 0)
+            self.ser.write(_PKT_STOP)
+            # flush (tcdrain) returns once the frame is on the wire; the
+            # timeout-bounded read below covers the slave's turnaround
             self.ser.flush()
-            time.sleep(0.1)
-            
+
             # Read response
+            if self.ser.timeout != 0.5:
+                self.ser.timeout = 0.5
             resp = self.ser.read(8)
             if len(resp) >= 4:
                 return True
             return False
         except Exception as e:
-            print(f"Stop command failed: {e}")
+            _log.warning("Stop command failed: %s", e)
             return False
 
     def is_busy(self) -> bool:
@@ -268,36 +410,28 @@ class MotorDriver:
             if not self.ser.is_open:
                 return False
             
-            # Build Modbus function 3 (Read Holding Registers) request
-            # Read register 0x0074 (Operating Status)
-            req = bytes([
-                SLAVE_ID, 0x03,  # Function: Read Holding Registers
-                0x00, 0x74,      # Address: 0x0074 (Operating Status)
-                0x00, 0x01       # Number of registers: 1
-            ])
-            crc = modbus_crc16(req).to_bytes(2, 'little')
-            packet = req + crc
-            
             # Clear buffers before sending
-            self.ser.reset_input_buffer()
-            self.ser.reset_output_buffer()
-            time.sleep(0.05)
-            
-            # Send request
-            self.ser.write(packet)
+            self._flush()
+
+            # Send prebuilt read of register 0x0074 (Operating Status)
+            self.ser.write(_PKT_READ_STATUS)
+            # flush (tcdrain) returns once the frame is on the wire; the
+            # timeout-bounded read below covers the slave's turnaround
             self.ser.flush()
-            time.sleep(0.1)
-            
-            # Read response
-            resp = self.ser.read(8)
-            if len(resp) >= 5 and resp[0] == SLAVE_ID and resp[1] == 0x03:
+
+            # Read into the reusable buffer — no per-poll allocation
+            if self.ser.timeout != 0.5:
+                self.ser.timeout = 0.5
+            n = self.ser.readinto(self._rxmv[:8])
+            buf = self._rxbuf
+            if n >= 5 and buf[0] == SLAVE_ID and buf[1] == 0x03:
                 # Bit 0 typically indicates motion status
-                status_value = (resp[3] << 8) | resp[4]
+                status_value = (buf[3] << 8) | buf[4]
                 is_moving = bool(status_value & 0x01)
                 return is_moving
             return False
         except Exception as e:
-            print(f"Check busy failed: {e}")
+            _log.warning("Check busy failed: %s", e)
             return False
 
     def check_rain_status(self) -> (bool, str):
@@ -311,58 +445,32 @@ class MotorDriver:
             if not self.ser.is_open:
                 self.ser.open()
             
-            # Build Modbus function 3 (Read Holding Registers) request
-            req = bytes([
-                SLAVE_ID, 0x03,  # Function: Read Holding Registers
-                0x00, 0xD5,      # Register address: 0x00D5 (213)
-                0x00, 0x01       # Number of registers: 1
-            ])
-            crc = modbus_crc16(req).to_bytes(2, 'little')
-            packet = req + crc
-            
             # Clear buffers before sending
-            self.ser.reset_input_buffer()
-            self.ser.reset_output_buffer()
-            time.sleep(0.05)
-            
-            # Send request
-            self.ser.write(packet)
+            self._flush()
+
+            # Send prebuilt read of register 0x00D5 (213, rain status)
+            self.ser.write(_PKT_READ_RAIN)
+            # flush (tcdrain) returns once the frame is on the wire; the
+            # timeout-bounded read below covers the slave's turnaround
             self.ser.flush()
-            time.sleep(0.1)  # Wait for response
-            
-            # Read response
-            resp = bytearray()
-            start_time = time.time()
-            while (time.time() - start_time) < 0.5:  # 500ms timeout
-                if self.ser.in_waiting:
-                    new_data = self.ser.read(self.ser.in_waiting)
-                    resp.extend(new_data)
-                    if len(resp) >= 5:  # Minimum expected response length
-                        break
-                time.sleep(0.01)
-            
-            # Debug output
-            #print(f"Rain status response: {resp.hex()}")
-            
-            # Check if response is valid
-            if len(resp) >= 5 and resp[0] == SLAVE_ID and resp[1] == 0x03:
-                # Based on the response format: [ID, FC, BYTE_COUNT, DATA_HI, DATA_LO, CRC_LO, CRC_HI]
-                # The register value is in the 4th and 5th bytes (index 3 and 4)
-                # For this specific controller, the rain status is in the second data byte (index 4)
-                reg_value_hi = resp[3] if len(resp) > 3 else 0
-                reg_value_lo = resp[4] if len(resp) > 4 else 0
-                
-                # Print debug info for both bytes
-                #print(f"Register value high byte: {reg_value_hi:08b} (binary), {reg_value_hi} (decimal)")
-                #print(f"Register value low byte: {reg_value_lo:08b} (binary), {reg_value_lo} (decimal)")
-                
-                # Based on the observed responses:
-                # 0103020000b844 - Not raining
-                # 0103020004b987 - Raining
-                # The difference is in the low byte (index 4), value 0x00 vs 0x04
-                # This suggests bit 2 (0-indexed) in the low byte indicates rain
-                is_raining = bool(reg_value_lo & (1 << 2))
-                
+
+            # Blocking sized read: returns as soon as the 7-byte reply
+            # [ID, FC, count, hi, lo, crc_lo, crc_hi] is complete instead
+            # of sleep-and-poll round-trips against in_waiting.
+            if self.ser.timeout != 0.5:
+                self.ser.timeout = 0.5
+            n = self.ser.readinto(self._rxmv[:7])
+            resp = self._rxmv[:n]
+
+            # Response format: [ID, FC, BYTE_COUNT, DATA_HI, DATA_LO, CRC_LO, CRC_HI].
+            # Observed frames: 0103020000b844 (dry) vs 0103020004b987
+            # (raining) — bit 2 of the low data byte carries the status.
+            # The CRC is checked so a corrupted frame doesn't silently
+            # parse as "not raining".
+            if n >= 7 and resp[0] == SLAVE_ID and resp[1] == 0x03:
+                if crc16_update(0xFFFF, resp[:5]) != (resp[5] | resp[6] << 8):
+                    return False, f"CRC mismatch in response: {resp.hex()}"
+                is_raining = bool(resp[4] & 0x04)
                 return True, f"Rain status: {'Raining' if is_raining else 'Not raining'}"
             else:
                 resp_hex = resp.hex() if resp else ""
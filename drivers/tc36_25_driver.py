@@ -36,8 +36,8 @@ class TC36_25:
             bytesize=serial.EIGHTBITS,
             parity=serial.PARITY_NONE,
             stopbits=serial.STOPBITS_ONE,
-            timeout=1.0,          # 1 s read timeout
-            write_timeout=1.0
+            timeout=0.3,          # 12-byte reply takes ~14 ms at 9600 baud
+            write_timeout=0.5
         )
 
     # -------------  Low–level helpers  ---------------------------------
@@ -4,15 +4,22 @@ import time
 
 def read_thp_sensor_data(port_name, baud_rate=9600, timeout=1):
     try:
-        ser = serial.Serial(port_name, baud_rate, timeout=timeout)
+        # Short per-line timeout: readline() blocks in the kernel until a
+        # line or 0.2 s passes, instead of a hot in_waiting spin loop.
+        ser = serial.Serial(port_name, baud_rate, timeout=0.2)
+        # Full settle after the DTR toggle on open — boards that
+        # auto-reset need the time or the probe below is lost and the
+        # mock-data fallback kicks in. Callers poll off-thread, so the
+        # wait doesn't touch the GUI.
         time.sleep(1)
+        ser.reset_input_buffer()
         ser.write(b'p\r\n')
 
         response = ""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            line = ser.readline().decode('utf-8', errors='ignore').strip()
+            if line:
                 response += line
                 try:
                     data = json.loads(response)
@@ -2,11 +2,14 @@ import sys
 import os
 import json
 from datetime import datetime
+from functools import lru_cache
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QStatusBar, QPushButton,
-                             QLabel, QGroupBox, QTabWidget, QSplashScreen)
+                             QLabel, QGroupBox, QTabWidget, QSplashScreen,
+                             QGraphicsItem)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QPixmap, QIcon
+import numpy as np
 import pyqtgraph as pg
 
 from controllers.temp_controller import TempController
@@ -18,9 +21,72 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+class CachedDateAxisItem(pg.DateAxisItem):
+    """Date axis that memoizes tick-label formatting.
+
+    At a 1 Hz tick the axis is repainted far more often than its tick
+    values change, and every repaint reformats the same epoch seconds
+    into the same date strings. An LRU cache keyed on the tick values
+    makes the repeat paints free.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_strings = lru_cache(maxsize=256)(self._format_strings)
+
+    def _format_strings(self, values, scale, spacing):
+        return super().tickStrings(list(values), scale, spacing)
+
+    def tickStrings(self, values, scale, spacing):
+        return self._cached_strings(tuple(values), scale, spacing)
+
+
 class MainWindow(QMainWindow):
+    # Rain indicator styles, one per state: reusing the same string
+    # objects lets Qt skip re-parsing when nothing changed, and the
+    # indicator is only touched on state transitions anyway.
+    _RAIN_STYLE_UNKNOWN = """
+        font-weight: bold;
+        font-size: 18px;
+        color: #a0a8b8;
+        padding: 15px;
+        background-color: #252b38;
+        border-radius: 10px;
+    """
+    _RAIN_STYLE_ERROR = """
+        font-weight: bold;
+        font-size: 18px;
+        color: #FFB74D;
+        padding: 15px;
+        background-color: rgba(255, 183, 77, 0.15);
+        border-radius: 10px;
+        border: 2px solid rgba(255, 183, 77, 0.3);
+    """
+    _RAIN_STYLE_RAINING = """
+        font-weight: bold;
+        font-size: 18px;
+        color: #FF6B6B;
+        padding: 15px;
+        background-color: rgba(255, 107, 107, 0.15);
+        border-radius: 10px;
+        border: 2px solid rgba(255, 107, 107, 0.3);
+    """
+    _RAIN_STYLE_CLEAR = """
+        font-weight: bold;
+        font-size: 18px;
+        color: #4ECDC4;
+        padding: 15px;
+        background-color: rgba(78, 205, 196, 0.15);
+        border-radius: 10px;
+        border: 2px solid rgba(78, 205, 196, 0.3);
+    """
+
     def __init__(self):
         super().__init__()
+        # Rendering knobs, set before any plot widget exists: antialiased
+        # 3 px lines are the dominant repaint cost for day-long traces,
+        # and OpenGL moves line rasterization off the CPU.
+        pg.setConfigOptions(antialias=False, useOpenGL=True)
         self.setWindowTitle("EM27 Control & Monitoring System - SciGlob")
         
         # Set window icon
@@ -83,14 +149,27 @@ class MainWindow(QMainWindow):
         """)
         main_layout.addWidget(self.main_tabs)
         
-        # Initialize data storage
-        self.timestamps = []
-        self.thp_temps = []
-        self.hums = []
-        self.pressures = []
+        # Initialize data storage: preallocated circular buffers holding
+        # 24 h of 1 Hz samples. The write index wraps in place, so the
+        # sampler never reallocates or shifts Python lists, and setData
+        # gets the float arrays pyqtgraph wants without per-tick
+        # list→ndarray coercion.
+        self._hist_cap = 86400
+        self._hist_idx = 0
+        self._hist_n = 0
+        self._buf_ts = np.empty(self._hist_cap)
+        self._buf_temp = np.empty(self._hist_cap)
+        self._buf_hum = np.empty(self._hist_cap)
+        self._buf_pres = np.empty(self._hist_cap)
+        # scratch arrays reused to present time-ordered views once the
+        # buffers have wrapped
+        self._view_bufs = tuple(np.empty(self._hist_cap) for _ in range(4))
+        self._hist_dirty = False
+        self._last_ylim = {}
         self.current_position = 0  # default: lid CLOSED
         self.was_raining = False
         self.already_sent_mail = False
+        self._rain_state = None  # indicator is restyled only on transitions
         
         # Email settings
         self.sender_email = "alerts@sciglob.com"
@@ -108,6 +187,12 @@ class MainWindow(QMainWindow):
         self.update_timer = QTimer(self)
         self.update_timer.timeout.connect(self.update_data)
         self.update_timer.start(1000)
+        # Repainting is driven separately from sampling: _repaint only
+        # touches the curves when a new sample has landed, so a slow
+        # redraw never backs up the sampler and quiet ticks cost nothing.
+        self.plot_timer = QTimer(self)
+        self.plot_timer.timeout.connect(self._repaint)
+        self.plot_timer.start(200)
         self.rain_timer = QTimer(self)
         self.rain_timer.timeout.connect(self.check_rain_status)
         self.rain_timer.start(1000)
@@ -280,9 +365,9 @@ class MainWindow(QMainWindow):
         dashboard_layout.addLayout(sensor_cards_layout)
         
         # 24h plots setup
-        date_axis_temp = pg.DateAxisItem(orientation='bottom')
-        date_axis_hum = pg.DateAxisItem(orientation='bottom')
-        date_axis_pres = pg.DateAxisItem(orientation='bottom')
+        date_axis_temp = CachedDateAxisItem(orientation='bottom')
+        date_axis_hum = CachedDateAxisItem(orientation='bottom')
+        date_axis_pres = CachedDateAxisItem(orientation='bottom')
 
         tabs = QTabWidget()
         tabs.setStyleSheet("""
@@ -321,6 +406,7 @@ class MainWindow(QMainWindow):
         self.temp_plot.setBackground('#1e2430')
         self.temp_plot.showGrid(x=True, y=True, alpha=0.3)
         self.temp_curve = self.temp_plot.plot(pen=pg.mkPen(color='#FF6B6B', width=3))
+        self._tune_curve(self.temp_curve)
         t_layout.addWidget(self.temp_plot)
         tabs.addTab(temp_tab, "🌡️ Temperature")
         
@@ -335,6 +421,7 @@ class MainWindow(QMainWindow):
         self.hum_plot.setBackground('#1e2430')
         self.hum_plot.showGrid(x=True, y=True, alpha=0.3)
         self.hum_curve = self.hum_plot.plot(pen=pg.mkPen(color='#4ECDC4', width=3))
+        self._tune_curve(self.hum_curve)
         h_layout.addWidget(self.hum_plot)
         tabs.addTab(hum_tab, "💧 Humidity")
         
@@ -349,6 +436,7 @@ class MainWindow(QMainWindow):
         self.pres_plot.setBackground('#1e2430')
         self.pres_plot.showGrid(x=True, y=True, alpha=0.3)
         self.pres_curve = self.pres_plot.plot(pen=pg.mkPen(color='#667eea', width=3))
+        self._tune_curve(self.pres_curve)
         p_layout.addWidget(self.pres_plot)
         tabs.addTab(pres_tab, "📊 Pressure")
 
@@ -378,6 +466,21 @@ class MainWindow(QMainWindow):
         
         self.main_tabs.addTab(dashboard, "🌡️ Temp Monitor")
     
+    @staticmethod
+    def _tune_curve(curve):
+        """Apply the draw-cost options shared by all history curves.
+
+        Peak downsampling caps the segments fed to arrayToQPath at
+        roughly the pixel width of the plot, and clip-to-view drops
+        points outside the visible x-range when zoomed in.
+        """
+        curve.setDownsampling(auto=True, method='peak')
+        curve.setClipToView(True)
+        # Cache the rasterized line so repaints triggered by overlays,
+        # resizes or status restyles reuse the pixmap; setData still
+        # dirties the item and re-renders it when samples arrive.
+        curve.curve.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
     def _create_controllers_tab(self):
         """Create the controllers tab"""
         controllers = QWidget()
@@ -739,50 +842,43 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.status.showMessage(f"Failed to send rain email: {e}")
 
+    def _set_rain_state(self, state, text, style):
+        """Restyle the rain indicator only when the state transitions."""
+        if state == self._rain_state:
+            return
+        self._rain_state = state
+        self.rain_indicator.setText(text)
+        self.rain_indicator.setStyleSheet(style)
+
     def check_rain_status(self):
         """Check rain status from motor controller, auto‐open or email on transitions."""
         if not self.motor_ctrl.is_connected():
-            self.rain_indicator.setText("❓ Rain Status: Unknown (Motor disconnected)")
-            self.rain_indicator.setStyleSheet("""
-                font-weight: bold; 
-                font-size: 18px; 
-                color: #a0a8b8;
-                padding: 15px;
-                background-color: #252b38;
-                border-radius: 10px;
-            """)
+            self._set_rain_state('unknown',
+                                 "❓ Rain Status: Unknown (Motor disconnected)",
+                                 self._RAIN_STYLE_UNKNOWN)
             return
 
         try:
-            success, message = self.motor_ctrl.driver.check_rain_status()
+            # cached result; the serial read itself runs on the motor
+            # I/O thread so this timer never blocks the event loop
+            success, message = self.motor_ctrl.poll_rain_status()
             raining_now = success and "Raining" in message
         except Exception as e:
-            self.rain_indicator.setText("⚠️ Rain Status: Error checking")
-            self.rain_indicator.setStyleSheet("""
-                font-weight: bold; 
-                font-size: 18px; 
-                color: #FFB74D;
-                padding: 15px;
-                background-color: rgba(255, 183, 77, 0.15);
-                border-radius: 10px;
-                border: 2px solid rgba(255, 183, 77, 0.3);
-            """)
+            self._set_rain_state('error',
+                                 "⚠️ Rain Status: Error checking",
+                                 self._RAIN_STYLE_ERROR)
             self.status.showMessage(f"Rain check error: {e}")
             return
 
         if raining_now:
-            self.rain_indicator.setText("🌧️ Rain Status: RAINING")
-            self.rain_indicator.setStyleSheet("""
-                font-weight: bold; 
-                font-size: 18px; 
-                color: #FF6B6B;
-                padding: 15px;
-                background-color: rgba(255, 107, 107, 0.15);
-                border-radius: 10px;
-                border: 2px solid rgba(255, 107, 107, 0.3);
-            """)
-            self.open_btn.setEnabled(False)
+            if self._rain_state != 'raining':
+                self._set_rain_state('raining',
+                                     "🌧️ Rain Status: RAINING",
+                                     self._RAIN_STYLE_RAINING)
+                self.open_btn.setEnabled(False)
 
+            # the protective actions stay per-tick: a lid reopened during
+            # rain must be closed again even without a state transition
             if self.current_position == 90:
                 self.status.showMessage("Auto-closing due to rain detection")
                 self.close_motor()
@@ -794,17 +890,11 @@ class MainWindow(QMainWindow):
             self.was_raining = True
 
         else:
-            self.rain_indicator.setText("☀️ Rain Status: Not raining")
-            self.rain_indicator.setStyleSheet("""
-                font-weight: bold; 
-                font-size: 18px; 
-                color: #4ECDC4;
-                padding: 15px;
-                background-color: rgba(78, 205, 196, 0.15);
-                border-radius: 10px;
-                border: 2px solid rgba(78, 205, 196, 0.3);
-            """)
-            self.open_btn.setEnabled(True)
+            if self._rain_state != 'clear':
+                self._set_rain_state('clear',
+                                     "☀️ Rain Status: Not raining",
+                                     self._RAIN_STYLE_CLEAR)
+                self.open_btn.setEnabled(True)
 
             self.was_raining = False
             self.already_sent_mail = False
@@ -819,25 +909,56 @@ class MainWindow(QMainWindow):
         self.lbl_t_value.setText(f"{temp:.1f}")
         self.lbl_h_value.setText(f"{hum:.1f}")
         self.lbl_p_value.setText(f"{pres:.1f}")
-        # Append to history
-        self.timestamps.append(now)
-        self.thp_temps.append(temp)
-        self.hums.append(hum)
-        self.pressures.append(pres)
-        # Trim to 24h
-        cutoff = now - 86400
-        while self.timestamps and self.timestamps[0] < cutoff:
-            self.timestamps.pop(0)
-            self.thp_temps.pop(0)
-            self.hums.pop(0)
-            self.pressures.pop(0)
-        # Update plots
-        self.temp_curve.setData(self.timestamps, self.thp_temps)
-        self.hum_curve.setData(self.timestamps, self.hums)
-        self.pres_curve.setData(self.timestamps, self.pressures)
-        self.temp_plot.enableAutoRange(axis='y')
-        self.hum_plot.enableAutoRange(axis='y')
-        self.pres_plot.enableAutoRange(axis='y')
+        # Append to history (the ring overwrites the oldest sample once
+        # 24 h are held, which is the old cutoff-trim behaviour)
+        i = self._hist_idx
+        self._buf_ts[i] = now
+        self._buf_temp[i] = temp
+        self._buf_hum[i] = hum
+        self._buf_pres[i] = pres
+        self._hist_idx = (i + 1) % self._hist_cap
+        if self._hist_n < self._hist_cap:
+            self._hist_n += 1
+        self._hist_dirty = True
+
+    def _repaint(self):
+        """Push new history onto the curves; no-op when nothing changed."""
+        if not self._hist_dirty:
+            return
+        self._hist_dirty = False
+        ts, temps, hums, pres_v = self._history_views()
+        for curve, plot, data, key in (
+                (self.temp_curve, self.temp_plot, temps, 'temp'),
+                (self.hum_curve, self.hum_plot, hums, 'hum'),
+                (self.pres_curve, self.pres_plot, pres_v, 'pres')):
+            curve.setData(ts, data)
+            # Re-rangefinding every tick makes the ViewBox walk all the
+            # data; only re-enable the y autorange when the data bounds
+            # actually moved by more than 2% of the span.
+            finite = np.isfinite(data)
+            if not finite.any():
+                continue
+            lo = float(data[finite].min())
+            hi = float(data[finite].max())
+            prev = self._last_ylim.get(key)
+            tol = (hi - lo or 1.0) * 0.02
+            if prev is None or abs(lo - prev[0]) > tol or abs(hi - prev[1]) > tol:
+                plot.enableAutoRange(axis='y')
+                self._last_ylim[key] = (lo, hi)
+
+    def _history_views(self):
+        """Time-ordered array views over the circular sample buffers."""
+        n = self._hist_n
+        bufs = (self._buf_ts, self._buf_temp, self._buf_hum, self._buf_pres)
+        if n < self._hist_cap:
+            return tuple(buf[:n] for buf in bufs)
+        # wrapped: unroll into the reusable scratch arrays
+        i = self._hist_idx
+        tail = self._hist_cap - i
+        for buf, view in zip(bufs, self._view_bufs):
+            view[:tail] = buf[i:]
+            view[tail:] = buf[:i]
+        return self._view_bufs
 
 def show_splash_screen(app):
     """Show splash screen at startup"""